@@ -0,0 +1,186 @@
+"""Benchmark determinístico do loop do jogo (sem janela nem GPU).
+
+Uso:
+    python -m benchmarks.bench_engine
+    python -m benchmarks.bench_engine --counts 10 100 --ticks 300 --render --json bench.json
+    python -m benchmarks.bench_engine --replay partida.nwr --json bench.json
+    python -m benchmarks.bench_engine --checkpoint quicksave.sav --ticks 600
+
+Para cada quantidade fixa de inimigos roda a simulação com semente e entrada
+roteirizada e mede passos/s, tempo por passo (p50/p99) e alocações.
+Com --replay, mede uma partida real gravada com main.py --record (src.replay).
+Com --checkpoint, começa direto de um estado salvo (F5 no jogo, src.snapshot),
+por exemplo uma onda avançada, com spawn automático ligado.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import statistics
+import time
+import tracemalloc
+
+from src import snapshot
+from src.config import MAP_FILE
+from src.game import Game, create_screen
+from src.input import ScriptedInput, circle_script
+from src.profiler import PHASES
+from src.replay import Replay, ReplayInput, state_checksum
+
+DEFAULT_COUNTS = (10, 100, 1000, 5000)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def make_game(screen, enemy_count, seed, batch_steering, map_path=MAP_FILE):
+    """Partida com contagem fixa de inimigos e jogador invencível"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(screen, seed=seed, input_source=ScriptedInput(circle_script()),
+                    batch_steering=batch_steering, map_path=map_path)
+        game.auto_spawn = False
+        game.player.health = 1e9
+        for _ in range(enemy_count):
+            game.spawn_enemy()
+    return game
+
+
+def time_ticks(game, ticks, render=False):
+    """(tempos por passo em ms, tempo total em s, coletas gen2) de ticks passos"""
+    frame_times = []
+    collections_before = gc.get_stats()[2]['collections']
+    start = time.perf_counter()
+    for _ in range(ticks):
+        t0 = time.perf_counter()
+        game.run_ticks(1, render=render)
+        frame_times.append((time.perf_counter() - t0) * 1000)
+    total = time.perf_counter() - start
+    return frame_times, total, gc.get_stats()[2]['collections'] - collections_before
+
+
+def bench(screen, enemy_count, ticks=600, warmup=60, seed=1234, render=False, batch_steering=None,
+          checkpoint=None):
+    game = make_game(screen, enemy_count, seed, batch_steering,
+                     checkpoint['map'] if checkpoint is not None else MAP_FILE)
+    if checkpoint is not None:
+        # Partida salva: continua dela com o spawn automático, jogador ainda invencível
+        snapshot.restore(game, checkpoint)
+        game.player.health = 1e9
+        game.auto_spawn = True
+        enemy_count = len(game.enemies)
+    game.run_ticks(warmup, render=render)
+    # Como no loop do jogo (Game.run): o que já existe sai da coleta de lixo
+    game.freeze_heap()
+
+    # Tempo por passo
+    frame_times, total, gen2_collections = time_ticks(game, ticks, render)
+    phases = {name: game.profiler.stats(name)[1] for name in PHASES}
+
+    # Alocações (medidas à parte: o tracemalloc deixa tudo mais lento)
+    alloc_ticks = max(1, ticks // 10)
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    game.run_ticks(alloc_ticks, render=render)
+    snapshot_after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = snapshot_after.compare_to(snapshot_before, 'filename')
+    allocated_blocks = sum(max(0, stat.count_diff) for stat in stats)
+
+    result = {
+        'enemies': enemy_count,
+        'ticks': ticks,
+        'ticks_per_sec': ticks / total,
+        'p50_ms': statistics.median(frame_times),
+        'p99_ms': percentile(frame_times, 0.99),
+        'max_ms': max(frame_times),
+        'gen2_collections': gen2_collections,
+        'alloc_blocks_per_tick': allocated_blocks / alloc_ticks,
+        'alloc_peak_kb': peak / 1024,
+        'phase_avg_ms': phases,
+        'score': game.score,
+        'alive': len(game.enemies),
+    }
+    game.close()
+    return result
+
+
+def bench_replay(screen, path, render=False):
+    """Reproduz um replay gravado medindo cada passo (carga de uma partida real)"""
+    replay = Replay.load(path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(screen, seed=replay.seed, input_source=ReplayInput(replay),
+                    batch_steering=replay.batch_steering, map_path=replay.map_path)
+    game.freeze_heap()
+
+    frame_times, total, gen2_collections = time_ticks(game, len(replay), render)
+    result = {
+        'replay': path,
+        'ticks': len(replay),
+        'ticks_per_sec': len(replay) / total,
+        'p50_ms': statistics.median(frame_times),
+        'p99_ms': percentile(frame_times, 0.99),
+        'max_ms': max(frame_times),
+        'gen2_collections': gen2_collections,
+        'phase_avg_ms': {name: game.profiler.stats(name)[1] for name in PHASES},
+        'frame_ms': frame_times,
+        'score': game.score,
+        'alive': len(game.enemies),
+        'matched': state_checksum(game) == replay.checksum,
+    }
+    game.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=DEFAULT_COUNTS)
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--warmup', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--render', action='store_true', help='inclui o desenho no tempo medido')
+    parser.add_argument('--no-numpy', action='store_true', help='força o movimento inimigo por inimigo')
+    parser.add_argument('--json', help='salva os resultados neste arquivo')
+    parser.add_argument('--replay', help='mede um replay gravado (main.py --record) em vez das contagens fixas')
+    parser.add_argument('--checkpoint', help='começa de um checkpoint (F5 no jogo) em vez das contagens fixas')
+    args = parser.parse_args()
+
+    screen = create_screen(headless=True)
+
+    if args.replay:
+        result = bench_replay(screen, args.replay, args.render)
+        print(f"{result['ticks']} passos  {result['ticks_per_sec']:.1f} passos/s  p50 {result['p50_ms']:.3f} ms  "
+              f"p99 {result['p99_ms']:.3f} ms  max {result['max_ms']:.3f} ms  gc2 {result['gen2_collections']}")
+        print('  ' + '  '.join(f"{name} {avg:.3f}" for name, avg in result['phase_avg_ms'].items() if avg))
+        print(f"{'✓' if result['matched'] else '❌'} Estado final "
+              f"{'igual ao da gravação' if result['matched'] else 'diferente da gravação'}")
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2)
+        return
+    batch_steering = False if args.no_numpy else None
+
+    checkpoint = snapshot.load(args.checkpoint) if args.checkpoint else None
+    counts = [0] if checkpoint is not None else args.counts
+
+    results = []
+    print(f"{'inimigos':>9} {'passos/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'gc2':>4} {'blocos/passo':>13}")
+    for count in counts:
+        result = bench(screen, count, args.ticks, args.warmup, args.seed, args.render, batch_steering, checkpoint)
+        results.append(result)
+        print(f"{result['enemies']:>9} {result['ticks_per_sec']:>10.1f} {result['p50_ms']:>8.3f} "
+              f"{result['p99_ms']:>8.3f} {result['max_ms']:>8.3f} {result['gen2_collections']:>4} "
+              f"{result['alloc_blocks_per_tick']:>13.1f}")
+        print('          ' + '  '.join(f"{name} {avg:.3f}" for name, avg in result['phase_avg_ms'].items() if avg))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
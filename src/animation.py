@@ -1,21 +1,160 @@
+from collections import OrderedDict
+
 import pygame
 
-class Animation:
+from src.config import TICK_MS
+
+# Variantes de frames já geradas: (frame, variante) -> Surface
+VARIANT_CACHE_SIZE = 512
+_variants = OrderedDict()  # LRU: as menos usadas saem primeiro
+_pinned = {}  # variantes pré-computadas no carregamento (nunca saem)
+
+
+# Uma variante é uma tupla de operações, aplicadas em ordem; podem ser somadas:
+# flipped() + tinted((255, 120, 120))
+def flipped(x=True, y=False):
+    return (('flip', x, y),)
+
+
+def tinted(color):
+    """Multiplica as cores (ex.: inimigo elite avermelhado)"""
+    return (('tint', tuple(color)),)
+
+
+def flashed(color=(255, 255, 255)):
+    """Soma uma cor (ex.: piscar branco ao levar dano)"""
+    return (('flash', tuple(color)),)
+
+
+def scaled(factor):
+    return (('scale', factor),)
+
+
+def outlined(color=(255, 255, 255), thickness=2):
+    return (('outline', tuple(color), thickness),)
+
+
+def _apply(surface, operation):
+    kind = operation[0]
+    if kind == 'flip':
+        return pygame.transform.flip(surface, operation[1], operation[2])
+    if kind == 'tint':
+        surface = surface.copy()
+        surface.fill(operation[1], special_flags=pygame.BLEND_RGB_MULT)
+        return surface
+    if kind == 'flash':
+        surface = surface.copy()
+        surface.fill(operation[1], special_flags=pygame.BLEND_RGB_ADD)
+        return surface
+    if kind == 'scale':
+        width, height = surface.get_size()
+        size = (max(1, round(width * operation[1])), max(1, round(height * operation[1])))
+        return pygame.transform.smoothscale(surface, size)
+    if kind == 'outline':
+        # Silhueta na cor do contorno, deslocada em volta do frame original
+        color, thickness = operation[1], operation[2]
+        silhouette = pygame.mask.from_surface(surface).to_surface(setcolor=color, unsetcolor=(0, 0, 0, 0))
+        result = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+        for dx, dy in ((-thickness, 0), (thickness, 0), (0, -thickness), (0, thickness)):
+            result.blit(silhouette, (dx, dy))
+        result.blit(surface, (0, 0))
+        return result
+    raise ValueError(f"variante desconhecida: {kind}")
+
+
+def variant_frame(frame, variant, pin=False):
+    """Frame com a variante aplicada, gerado só no primeiro uso.
+
+    pin=True guarda fora do LRU (para variantes pré-computadas no carregamento).
+    """
+    if not variant:
+        return frame
+    key = (frame, variant)
+    surface = _pinned.get(key)
+    if surface is not None:
+        return surface
+
+    surface = _variants.get(key)
+    if surface is not None:
+        _variants.move_to_end(key)
+        return surface
+
+    surface = frame
+    for operation in variant:
+        surface = _apply(surface, operation)
+    if pin:
+        _pinned[key] = surface
+    else:
+        _variants[key] = surface
+        if len(_variants) > VARIANT_CACHE_SIZE:
+            _variants.popitem(last=False)
+    return surface
+
+
+def clear_variant_cache():
+    _variants.clear()
+    _pinned.clear()
+
+
+class Clip:
+    """Animação compartilhada (imutável): frames e duração de cada frame"""
+    __slots__ = ('frames', 'frame_duration')
+
     def __init__(self, frames, frame_duration=100):
-        self.frames = frames
+        self.frames = tuple(frames)
         self.frame_duration = frame_duration
+
+    def precompute(self, variants):
+        """Gera agora as variantes de todos os frames (evita o custo no primeiro uso)"""
+        for variant in variants:
+            for frame in self.frames:
+                variant_frame(frame, variant, pin=True)
+
+
+class Animation:
+    """Estado de reprodução de um Clip (o que muda por entidade: frame atual e tempo)"""
+    __slots__ = ('clip', 'variant', 'current_frame', 'elapsed')
+
+    def __init__(self, clip, frame_duration=100, variant=None):
+        # Aceita um Clip compartilhado ou, por compatibilidade, uma lista de frames
+        self.clip = clip if isinstance(clip, Clip) else Clip(clip, frame_duration)
+        self.variant = variant  # variante padrão desta animação (ex.: elite tingido)
+        self.current_frame = 0
+        self.elapsed = 0
+
+    @property
+    def frames(self):
+        return self.clip.frames
+
+    @property
+    def frame_duration(self):
+        return self.clip.frame_duration
+
+    def play(self, clip):
+        """Troca de clip e recomeça do primeiro frame"""
+        self.clip = clip
         self.current_frame = 0
-        self.last_update = pygame.time.get_ticks()
+        self.elapsed = 0
+
+    def swap(self, clip):
+        """Troca de clip mantendo a posição (ex.: fallback -> frames reais)"""
+        self.clip = clip
+        self.current_frame %= len(clip.frames)
 
-    def update(self):
-        now = pygame.time.get_ticks()
-        if now - self.last_update > self.frame_duration:
-            self.last_update = now
-            self.current_frame = (self.current_frame + 1) % len(self.frames)
+    def update(self, dt=TICK_MS):
+        # Avança pelo tempo da simulação (não pelo relógio real), para ficar em sincronia com o jogo
+        clip = self.clip
+        self.elapsed += dt
+        while self.elapsed > clip.frame_duration:
+            self.elapsed -= clip.frame_duration
+            self.current_frame = (self.current_frame + 1) % len(clip.frames)
 
-    def get_current_frame(self):
-        return self.frames[self.current_frame]
+    def get_current_frame(self, variant=None):
+        """Frame atual; variant (somada à variante padrão) devolve a versão derivada em cache"""
+        if self.variant:
+            variant = self.variant + variant if variant else self.variant
+        return variant_frame(self.clip.frames[self.current_frame], variant)
 
     def reset(self):
         self.current_frame = 0
-        self.last_update = pygame.time.get_ticks()
\ No newline at end of file
+        self.elapsed = 0
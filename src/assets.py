@@ -0,0 +1,244 @@
+import json
+import logging
+import os
+import zlib
+import pygame
+
+from src.config import FALLBACK_CACHE_DIR, get_resource_path
+
+logger = logging.getLogger(__name__)
+
+# Tamanho padrão dos frames (sprites originais são escalados para 128x128)
+FRAME_SIZE = (128, 128)
+
+# Cache global de frames: (caminho, tamanho) -> Surface
+_frame_cache = {}
+
+# Cache global de animações: (personagem, estado, direção, frames, tamanho) -> tupla de Surfaces
+_clip_cache = {}
+
+# Atlas carregados: personagem -> (Surface, índice) ou None se não houver atlas
+_atlases = {}
+
+# Fallbacks desenhados: (personagem, estado, direção) -> tupla de Surfaces
+_fallback_cache = {}
+
+# Animações sendo carregadas em segundo plano (src.loader): chaves de _clip_cache
+_pending = set()
+
+# Aumenta a cada animação que chega do carregamento em segundo plano; os sprites
+# comparam com o valor que viram por último para trocar o fallback pelos frames reais
+generation = 0
+
+
+def clip_key(character, state, direction, frame_count, size=FRAME_SIZE):
+    return (character, state, direction, frame_count, size)
+
+
+def frame_path(character, state, direction, index):
+    """Caminho do arquivo de um frame"""
+    return get_resource_path(os.path.join('images', character, state, direction, f'frame_{index}.png'))
+
+
+def atlas_dir():
+    """Pasta dos atlas gerados por `python -m src.atlas`"""
+    return get_resource_path('atlas')
+
+
+def load_atlas(character):
+    """Carrega o atlas de um personagem com uma única decodificação.
+
+    Retorna (Surface, índice) ou None se o atlas não foi gerado.
+    """
+    if character in _atlases:
+        return _atlases[character]
+
+    atlas = None
+    index_path = os.path.join(atlas_dir(), f'{character}.json')
+    if os.path.exists(index_path):
+        try:
+            with open(index_path, encoding='utf-8') as f:
+                index = json.load(f)
+            sheet = pygame.image.load(os.path.join(atlas_dir(), index['image'])).convert_alpha()
+            atlas = (sheet, index)
+        except (OSError, ValueError, KeyError, pygame.error) as e:
+            logger.error("❌ Erro ao carregar atlas %s: %s", character, e)
+
+    _atlases[character] = atlas
+    return atlas
+
+
+def clip_duration(character, state, direction, default):
+    """Duração dos frames segundo o índice do atlas (ou o padrão da classe)"""
+    atlas = load_atlas(character)
+    if atlas is None:
+        return default
+    clip = atlas[1]['clips'].get(f'{state}/{direction}')
+    return clip['duration'] if clip else default
+
+
+def load_frame(path, size=FRAME_SIZE):
+    """Carrega um frame do disco uma única vez e reaproveita nas próximas chamadas"""
+    key = (path, size)
+    frame = _frame_cache.get(key)
+    if frame is None:
+        frame = pygame.image.load(path).convert_alpha()
+        if frame.get_size() != size:
+            frame = pygame.transform.scale(frame, size)
+        _frame_cache[key] = frame
+    return frame
+
+
+def _frames_from_atlas(atlas, state, direction, frame_count, size):
+    """Frames como subsurfaces do atlas (sem cópia de pixels)"""
+    sheet, index = atlas
+    clip = index['clips'].get(f'{state}/{direction}')
+    if clip is None:
+        return None
+
+    frames = []
+    for rect in clip['frames'][:frame_count]:
+        frame = sheet.subsurface(rect)
+        if frame.get_size() != size:
+            frame = pygame.transform.scale(frame, size)
+        frames.append(frame)
+    return frames
+
+
+def _frames_from_disk(character, state, direction, frame_count, size):
+    """Frames lidos arquivo por arquivo"""
+    frames = []
+    for i in range(frame_count):
+        path = frame_path(character, state, direction, i)
+        if os.path.exists(path):
+            frames.append(load_frame(path, size))
+    return frames
+
+
+def load_frames(character, state, direction, frame_count, size=FRAME_SIZE):
+    """Retorna os frames de um estado/direção, compartilhados entre todos os sprites.
+
+    Usa o atlas do personagem quando existir; senão lê os arquivos individuais.
+    Retorna None se nenhum frame existir.
+    """
+    key = clip_key(character, state, direction, frame_count, size)
+    if key in _clip_cache:
+        return _clip_cache[key]
+    if key in _pending:
+        return None  # ainda carregando: quem chamou usa o fallback por enquanto
+
+    atlas = load_atlas(character)
+    if atlas is not None:
+        frames = _frames_from_atlas(atlas, state, direction, frame_count, size)
+    else:
+        frames = _frames_from_disk(character, state, direction, frame_count, size)
+
+    frames = tuple(frames) if frames else None
+    _clip_cache[key] = frames
+    return frames
+
+
+def is_cached(key):
+    return key in _clip_cache
+
+
+def is_pending(character, state, direction, frame_count, size=FRAME_SIZE):
+    return clip_key(character, state, direction, frame_count, size) in _pending
+
+
+def mark_pending(key):
+    _pending.add(key)
+
+
+def store_frame(path, size, frame):
+    """Guarda um frame decodificado fora da thread principal (já convertido)"""
+    if frame.get_size() != size:
+        frame = pygame.transform.scale(frame, size)
+    _frame_cache[(path, size)] = frame
+    return frame
+
+
+def store_clip(key, frames):
+    """Publica uma animação carregada em segundo plano"""
+    global generation
+    _clip_cache[key] = tuple(frames) if frames else None
+    _pending.discard(key)
+    generation += 1
+
+
+def store_atlas(character, atlas, keys):
+    """Publica o atlas de um personagem; as animações dele saem do atlas a partir de agora"""
+    global generation
+    _atlases[character] = atlas
+    for key in keys:
+        _pending.discard(key)
+    generation += 1
+
+
+def _fallback_path(character, state, direction, draw):
+    """Arquivo do fallback no cache em disco; muda junto com o código que desenha"""
+    code = draw.__code__
+    version = zlib.crc32(code.co_code + repr(code.co_consts).encode())
+    return os.path.join(FALLBACK_CACHE_DIR, f'{character}_{state}_{direction}_{version:08x}.png')
+
+
+def _load_strip(path):
+    """Frames (FRAME_SIZE) lado a lado numa imagem só"""
+    try:
+        strip = pygame.image.load(path).convert_alpha()
+    except (pygame.error, FileNotFoundError):
+        return None
+    width, height = FRAME_SIZE
+    count = strip.get_width() // width
+    return tuple(strip.subsurface((i * width, 0, width, height)) for i in range(count)) or None
+
+
+def _save_strip(path, frames):
+    width, height = FRAME_SIZE
+    strip = pygame.Surface((width * len(frames), height), pygame.SRCALPHA)
+    for i, frame in enumerate(frames):
+        strip.blit(frame, (i * width, 0))
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        pygame.image.save(strip, path)
+    except (OSError, pygame.error) as e:
+        logger.warning("❌ Erro ao salvar fallback %s: %s", path, e)
+
+
+def fallback_frames(character, state, direction, draw):
+    """Frames de fallback de um estado/direção, desenhados uma única vez e compartilhados.
+
+    draw(state, direction) desenha os frames (FRAME_SIZE). Se FALLBACK_CACHE_DIR
+    estiver definido, o resultado também fica salvo em disco entre execuções.
+    """
+    key = (character, state, direction)
+    frames = _fallback_cache.get(key)
+    if frames is not None:
+        return frames
+
+    path = _fallback_path(character, state, direction, draw) if FALLBACK_CACHE_DIR else None
+    if path is not None and os.path.exists(path):
+        frames = _load_strip(path)
+    if frames is None:
+        frames = tuple(draw(state, direction))
+        if path is not None:
+            _save_strip(path, frames)
+
+    _fallback_cache[key] = frames
+    return frames
+
+
+def preload(character, states, directions, frame_counts, size=FRAME_SIZE):
+    """Preenche o cache na inicialização para que os spawns não acessem o disco"""
+    for state in states:
+        for direction in directions:
+            load_frames(character, state, direction, frame_counts[state], size)
+
+
+def clear_cache():
+    """Esvazia o cache (ex.: ao recriar a janela)"""
+    _frame_cache.clear()
+    _clip_cache.clear()
+    _atlases.clear()
+    _pending.clear()
+    _fallback_cache.clear()
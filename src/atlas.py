@@ -0,0 +1,92 @@
+"""Empacotamento dos frames de cada personagem em um único atlas.
+
+Etapa de build (rodar uma vez, e de novo sempre que a arte mudar):
+
+    python -m src.atlas
+
+Gera assets/atlas/<personagem>.png com todos os estados/direções e
+assets/atlas/<personagem>.json com os retângulos e a duração de cada frame.
+"""
+import json
+import logging
+import os
+import pygame
+
+from src import assets, log
+
+ATLAS_VERSION = 1
+
+# Nome fixo: com python -m src.atlas, __name__ seria '__main__', fora do logger 'src' configurado em src.log
+logger = logging.getLogger('src.atlas')
+
+
+def build_atlas(sprite_class, size=assets.FRAME_SIZE, output_dir=None):
+    """Gera o atlas e o índice de uma classe de sprite (Player, Enemy...)"""
+    character = sprite_class.CHARACTER
+    output_dir = output_dir or assets.atlas_dir()
+    width, height = size
+
+    # Lê os frames do disco (sem convert_alpha: não precisa de janela)
+    rows = []
+    for state in sprite_class.STATES:
+        for direction in sprite_class.DIRECTIONS:
+            frames = []
+            for i in range(sprite_class.FRAME_COUNTS[state]):
+                path = assets.frame_path(character, state, direction, i)
+                if os.path.exists(path):
+                    frame = pygame.image.load(path)
+                    if frame.get_size() != size:
+                        frame = pygame.transform.scale(frame, size)
+                    frames.append(frame)
+            if frames:
+                rows.append((state, direction, frames))
+
+    if not rows:
+        logger.warning("✗ Nenhum frame encontrado para %s", character)
+        return None
+
+    # Uma linha por estado/direção, um frame por coluna
+    columns = max(len(frames) for _, _, frames in rows)
+    sheet = pygame.Surface((columns * width, len(rows) * height), pygame.SRCALPHA, 32)
+    clips = {}
+
+    for row, (state, direction, frames) in enumerate(rows):
+        rects = []
+        for column, frame in enumerate(frames):
+            x, y = column * width, row * height
+            sheet.blit(frame, (x, y))
+            rects.append([x, y, width, height])
+        clips[f'{state}/{direction}'] = {
+            'duration': sprite_class.FRAME_DURATIONS[state],
+            'frames': rects
+        }
+
+    os.makedirs(output_dir, exist_ok=True)
+    image_path = os.path.join(output_dir, f'{character}.png')
+    index_path = os.path.join(output_dir, f'{character}.json')
+    pygame.image.save(sheet, image_path)
+
+    index = {
+        'version': ATLAS_VERSION,
+        'image': f'{character}.png',
+        'frame_size': [width, height],
+        'clips': clips
+    }
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+
+    logger.info("✓ Atlas %s: %d animações, %dx%d -> %s", character, len(rows), sheet.get_width(), sheet.get_height(),
+                image_path)
+    return index_path
+
+
+if __name__ == '__main__':
+    from src.player import Player
+    from src.enemy import Enemy
+
+    log.setup_logging()
+    pygame.init()
+    for sprite_class in (Player, Enemy):
+        build_atlas(sprite_class)
+    pygame.quit()
+    log.shutdown_logging()
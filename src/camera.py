@@ -0,0 +1,39 @@
+import pygame
+
+
+class Camera:
+    """Janela de visão sobre um mundo que pode ser maior que a tela.
+
+    - rect: área visível em coordenadas do mundo (segue o jogador, presa ao mundo)
+    - draw_margin: folga para não cortar sprites que estão entrando na tela
+    - active_margin: folga da área em que os inimigos são atualizados a cada passo;
+      fora dela ficam na faixa "distante", atualizada com menos frequência
+    """
+
+    def __init__(self, width, height, world, draw_margin=128, active_margin=400):
+        self.rect = pygame.Rect(0, 0, width, height)
+        self.world = world
+        self.draw_margin = draw_margin
+        self.active_margin = active_margin
+        self.rect.clamp_ip(world)
+
+    def view_rect(self, center):
+        """Área visível centrada num ponto, sem sair do mundo (não muda a câmera)"""
+        rect = self.rect.copy()
+        rect.center = center
+        return rect.clamp(self.world)
+
+    def follow(self, center):
+        self.rect = self.view_rect(center)
+
+    def active_rect(self):
+        """Área em que as entidades recebem atualização completa"""
+        margin = self.active_margin
+        return self.rect.inflate(margin * 2, margin * 2)
+
+    def visible(self, rect, view=None):
+        """True se rect (mundo) aparece na visão, com a folga de desenho"""
+        view = view or self.rect
+        margin = self.draw_margin
+        return (rect.right > view.left - margin and rect.left < view.right + margin
+                and rect.bottom > view.top - margin and rect.top < view.bottom + margin)
@@ -0,0 +1,108 @@
+"""Colisão contínua: testes feitos ao longo do movimento do passo, não só na posição final.
+
+Com passos maiores (simulação a 30 Hz) ou inimigos rápidos, um retângulo pode
+atravessar outro entre dois passos sem nunca sobrepor nas posições testadas.
+- swept_aabb: instante em que um retângulo em movimento encosta em outro
+- arc_sweep_hits: a lâmina da espada (segmento a partir do centro) varrendo um
+  arco entre dois ângulos, amostrada densa o bastante para nada passar entre as amostras
+"""
+import math
+
+import pygame
+
+# Distância máxima (px) entre duas amostras da ponta da lâmina; menor que qualquer hitbox
+SWEEP_STEP = 16
+
+
+def swept_aabb(rect, dx, dy, target):
+    """Fração (0..1) do deslocamento (dx, dy) em que rect passa a sobrepor target; None se não sobrepõe.
+
+    Sobreposição como em Rect.colliderect (encostar a borda não conta); 0 se já começa sobrepondo.
+    """
+    if dx == 0:
+        if rect.right <= target.left or rect.left >= target.right:
+            return None
+        x_entry, x_exit = -math.inf, math.inf
+    elif dx > 0:
+        x_entry, x_exit = (target.left - rect.right) / dx, (target.right - rect.left) / dx
+    else:
+        x_entry, x_exit = (target.right - rect.left) / dx, (target.left - rect.right) / dx
+
+    if dy == 0:
+        if rect.bottom <= target.top or rect.top >= target.bottom:
+            return None
+        y_entry, y_exit = -math.inf, math.inf
+    elif dy > 0:
+        y_entry, y_exit = (target.top - rect.bottom) / dy, (target.bottom - rect.top) / dy
+    else:
+        y_entry, y_exit = (target.bottom - rect.top) / dy, (target.top - rect.bottom) / dy
+
+    entry = max(x_entry, y_entry)
+    exit_ = min(x_exit, y_exit)
+    if entry >= exit_ or exit_ <= 0 or entry >= 1:
+        return None
+    return max(entry, 0.0)
+
+
+def sweep_rect(rect, dx, dy):
+    """Retângulo que cobre rect em todo o deslocamento (dx, dy) (broad phase)"""
+    return rect.union(rect.move(dx, dy))
+
+
+def _arc_angles(radius, start, end, step=SWEEP_STEP):
+    """Ângulos (graus) de start a end, com a ponta andando no máximo step px entre eles"""
+    count = max(1, math.ceil(abs(math.radians(end - start)) * radius / step))
+    return [start + (end - start) * i / count for i in range(count + 1)]
+
+
+def _tip(center, radius, angle):
+    rad = math.radians(angle)
+    return center[0] + radius * math.cos(rad), center[1] + radius * math.sin(rad)
+
+
+def arc_sweep_hits(center, radius, start, end, rect, step=SWEEP_STEP):
+    """True se a lâmina (de center até radius) encosta em rect em algum ponto do arco start..end (graus)"""
+    for angle in _arc_angles(radius, start, end, step):
+        if rect.clipline(center, _tip(center, radius, angle)):
+            return True
+    return False
+
+
+def arc_bounds(center, radius, start, end):
+    """Retângulo que contém todo o setor varrido (broad phase e debug)"""
+    points = [center, _tip(center, radius, start), _tip(center, radius, end)]
+    low, high = min(start, end), max(start, end)
+    # Pontos extremos do círculo (0°, 90°, 180°, 270°) que caem dentro do arco
+    for axis in range(math.ceil(low / 90) * 90, math.floor(high / 90) * 90 + 1, 90):
+        points.append(_tip(center, radius, axis))
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    left, top = math.floor(min(xs)), math.floor(min(ys))
+    return pygame.Rect(left, top, math.ceil(max(xs)) - left + 1, math.ceil(max(ys)) - top + 1)
+
+
+class HitRegistry:
+    """Alvos já atingidos pelo golpe atual: cada golpe (attack_id) acerta um alvo no máximo uma vez"""
+    __slots__ = ('attack_id', 'hits')
+
+    def __init__(self):
+        self.attack_id = 0
+        self.hits = set()
+
+    def register(self, attack_id, target):
+        """True se é o primeiro acerto do golpe attack_id em target (e o registra)"""
+        if attack_id != self.attack_id:
+            self.attack_id = attack_id
+            self.hits.clear()
+        if target in self.hits:
+            return False
+        self.hits.add(target)
+        return True
+
+    def hit(self, attack_id, target):
+        """True se o golpe attack_id já acertou target"""
+        return attack_id == self.attack_id and target in self.hits
+
+    def forget(self, target):
+        """Esquece um alvo que saiu do jogo (o sprite volta ao pool e pode reaparecer)"""
+        self.hits.discard(target)
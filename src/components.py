@@ -0,0 +1,162 @@
+"""Componentes compartilhados pelas entidades (Player, Enemy).
+
+Cada componente guarda só um aspecto da entidade, em registros com __slots__:
+- Body: hitbox principal e de colisão, sempre centradas juntas
+- Animator: qual clip está tocando e em que ponto; os clips (frames e duração)
+  ficam num ClipSet compartilhado por todas as instâncias da classe
+
+O comportamento de cada tipo de inimigo vem de dados (src.enemy_types), não de subclasses.
+"""
+import logging
+
+import pygame
+
+from src import assets, log
+from src.animation import Animation, Clip
+from src.config import TICK_MS
+
+logger = logging.getLogger(__name__)
+
+
+class Body:
+    """Hitbox principal (rect) e hitbox de colisão menor, centrada nela"""
+    __slots__ = ('rect', 'collision_rect')
+
+    def __init__(self, size, collision_size, center=(0, 0)):
+        self.rect = pygame.Rect((0, 0), size)
+        self.collision_rect = pygame.Rect((0, 0), collision_size)
+        self.place(center)
+
+    def place(self, center):
+        self.rect.center = center
+        self.collision_rect.center = center
+
+    def move(self, dx, dy):
+        self.rect.x += dx
+        self.rect.y += dy
+        self.collision_rect.center = self.rect.center
+
+    def clamp(self, left, top, right, bottom):
+        """Mantém a hitbox principal dentro dos limites"""
+        rect = self.rect
+        rect.left = max(left, rect.left)
+        rect.right = min(right, rect.right)
+        rect.top = max(top, rect.top)
+        rect.bottom = min(bottom, rect.bottom)
+        self.collision_rect.center = rect.center
+
+
+class ClipSet:
+    """Clips de uma classe de entidade por (estado, direção), compartilhados por todas as instâncias.
+
+    owner é a classe da entidade: define CHARACTER, STATES, DIRECTIONS,
+    FRAME_COUNTS, FRAME_DURATIONS e create_fallback_clip(state, direction).
+    """
+    __slots__ = ('owner', 'clips', 'generation')
+
+    _shared = {}  # classe -> ClipSet
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.clips = {}
+        self.generation = assets.generation
+        self.load()
+
+    @classmethod
+    def of(cls, owner):
+        clipset = cls._shared.get(owner)
+        if clipset is None:
+            clipset = cls._shared[owner] = cls(owner)
+        return clipset
+
+    def _asset_clip(self, state, direction):
+        owner = self.owner
+        frames = assets.load_frames(owner.CHARACTER, state, direction, owner.FRAME_COUNTS[state])
+        if not frames:
+            return None
+        duration = assets.clip_duration(owner.CHARACTER, state, direction, owner.FRAME_DURATIONS[state])
+        return Clip(frames, duration)
+
+    def load(self):
+        """Carrega os clips de todas as direções (fallback onde faltar imagem)"""
+        owner = self.owner
+        character = owner.CHARACTER
+        for state in owner.STATES:
+            for direction in owner.DIRECTIONS:
+                try:
+                    clip = self._asset_clip(state, direction)
+                    if clip is not None:
+                        log.count('clips_loaded')
+                        logger.debug("✓ %s %s_%s: %d frames", character, state, direction, len(clip.frames))
+                    elif assets.is_pending(character, state, direction, owner.FRAME_COUNTS[state]):
+                        log.count('clips_pending')
+                        logger.debug("… %s %s_%s: carregando em segundo plano, usando fallback",
+                                     character, state, direction)
+                        clip = owner.create_fallback_clip(state, direction)
+                    else:
+                        log.count('clips_fallback')
+                        logger.debug("✗ Criando fallback para %s %s_%s", character, state, direction)
+                        clip = owner.create_fallback_clip(state, direction)
+                except Exception as e:
+                    logger.error("❌ Erro em %s %s_%s: %s", character, state, direction, e)
+                    clip = owner.create_fallback_clip(state, direction)
+                self.clips[(state, direction)] = clip
+
+    def refresh(self):
+        """Troca os fallbacks pelos clips que terminaram de carregar em segundo plano"""
+        owner = self.owner
+        self.generation = assets.generation
+        for state in owner.STATES:
+            for direction in owner.DIRECTIONS:
+                current = self.clips[(state, direction)]
+                frames = assets.load_frames(owner.CHARACTER, state, direction, owner.FRAME_COUNTS[state])
+                if frames and current.frames is not frames:
+                    self.clips[(state, direction)] = self._asset_clip(state, direction)
+
+
+class Animator:
+    """Qual clip a entidade está tocando e em que ponto (o único estado de animação por instância)"""
+    __slots__ = ('clipset', 'state', 'direction', 'playback', 'generation')
+
+    def __init__(self, owner, state='idle', direction='down'):
+        self.clipset = ClipSet.of(owner)
+        self.state = state
+        self.direction = direction
+        self.playback = Animation(self.clipset.clips[(state, direction)])
+        self.generation = self.clipset.generation
+
+    def play(self, state, direction):
+        """Troca de animação; recomeça do primeiro frame se o estado ou a direção mudou"""
+        if state != self.state or direction != self.direction:
+            self.state = state
+            self.direction = direction
+            self.playback.play(self.clipset.clips[(state, direction)])
+
+    def restart(self, state, direction):
+        """Recomeça o clip, se for o que está tocando (trocar de clip já recomeça)"""
+        if state == self.state and direction == self.direction:
+            self.playback.reset()
+
+    def update(self, dt=TICK_MS):
+        if self.generation != assets.generation:
+            self._sync()
+        self.playback.update(dt)
+
+    def _sync(self):
+        """Acompanha os clips que chegaram do carregamento em segundo plano"""
+        clipset = self.clipset
+        if clipset.generation != assets.generation:
+            clipset.refresh()
+        self.generation = clipset.generation
+        clip = clipset.clips[(self.state, self.direction)]
+        if clip is not self.playback.clip:
+            self.playback.swap(clip)
+
+    def frame(self, variant=None):
+        return self.playback.get_current_frame(variant)
+
+    def reset(self, state='idle', direction='down'):
+        """Volta ao início (ex.: sprite reaproveitado do pool)"""
+        self.state = state
+        self.direction = direction
+        self.playback.play(self.clipset.clips[(state, direction)])
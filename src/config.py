@@ -2,10 +2,60 @@ import os
 import sys
 
 # Configurações da janela
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 600
+SCREEN_WIDTH = 1600
+SCREEN_HEIGHT = 1200
 FPS = 60
-TITLE = "Meu RPG"
+TITLE = "NemesisoftheWord"
+
+# Simulação em passo fixo (independente da taxa de desenho). TICK_RATE=30 alivia hardware fraco
+TICK_RATE = int(os.environ.get('TICK_RATE', 60))
+TICK_MS = 1000 / TICK_RATE
+# Velocidades (px por passo) e durações (em passos) do jogo são dadas para 60 Hz
+REFERENCE_TICK_RATE = 60
+TICK_SCALE = REFERENCE_TICK_RATE / TICK_RATE
+MAX_FRAME_TIME = 250  # ms; acima disso o jogo desacelera em vez de acumular passos sem fim
+TIME_SCALE = 1.0  # > 1 roda a simulação mais rápido que o tempo real
+
+# Sprites pré-alocados (pool)
+ENEMY_POOL_SIZE = 32
+EFFECT_POOL_SIZE = 8
+
+# Carregamento de imagens em segundo plano
+ASSET_WORKERS = 4
+ASSET_POLL_BUDGET_MS = 4  # tempo máximo por frame para converter/publicar imagens prontas
+LOADING_SCREEN_MAX_MS = 2000  # depois disso o jogo começa com os fallbacks e termina de carregar jogando
+
+# Cache em disco dos sprites de fallback (builds sem arte: CI, servidores headless). None = só em memória
+FALLBACK_CACHE_DIR = os.environ.get('FALLBACK_CACHE_DIR')
+
+# Logging (src.log): nível, arquivo opcional e tamanho do buffer circular da escrita em segundo plano
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_FILE = os.environ.get('LOG_FILE')
+LOG_BUFFER_SIZE = 1000
+
+# Ondas (src.waves): spawns ativados por passo e tempo por frame para criar os sprites da onda
+SPAWN_MAX_PER_TICK = 2
+SPAWN_PREPARE_BUDGET_MS = 1.0
+
+# Checkpoint salvo com F5 e carregado com F9 (src.snapshot)
+CHECKPOINT_FILE = "quicksave.sav"
+
+# Pathfinding no próprio processo (src.flowfield): níveis do BFS calculados por passo
+FLOW_FIELD_LEVELS_PER_TICK = 32
+
+# Câmera: folga de desenho, área de atualização completa e intervalo (em passos) dos inimigos distantes
+CAMERA_DRAW_MARGIN = 128
+CAMERA_ACTIVE_MARGIN = 400
+FAR_UPDATE_INTERVAL = 4
+
+# Espada: arco (graus, centrado na direção do jogador) varrido durante o ataque
+SWORD_ARC = 120
+
+
+def scaled_ticks(ticks):
+    """Duração em passos a 60 Hz convertida para a taxa atual da simulação"""
+    return max(1, round(ticks / TICK_SCALE))
+
 
 # Cores
 BLACK = (0, 0, 0)
@@ -13,23 +63,36 @@ WHITE = (255, 255, 255)
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
+YELLOW = (255, 255, 0)
 
 
 # Caminhos para assets
-def get_resource_path(relative_path):
+def get_base_path():
+    """Pasta com os dados do jogo (assets, maps), independente do diretório atual"""
     try:
         # PyInstaller cria uma pasta temporária e caminho diferente
-        base_path = sys._MEIPASS
+        return sys._MEIPASS
     except Exception:
-        base_path = os.path.abspath(".")
+        return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-    return os.path.join(base_path, "assets", relative_path)
+
+def get_resource_path(relative_path):
+    return os.path.join(get_base_path(), "assets", relative_path)
+
+
+def get_map_path(path):
+    """Caminho de um mapa: relativo à pasta do jogo (como MAP_FILE), ou absoluto"""
+    return path if os.path.isabs(path) else os.path.join(get_base_path(), path)
 
 
 # Imagens - usando caminhos relativos simples para evitar erros
 PLAYER_IMAGE = "assets/images/player.png"
 BACKGROUND_IMAGE = "assets/images/backgrounds.png"
 
+# Mapa do Tiled (vazio ou ausente = arena padrão do tamanho da tela), relativo à pasta do jogo.
+# Replays e snapshots guardam este caminho relativo; get_map_path() resolve ao carregar
+MAP_FILE = "maps/level1.tmx"
+
 # Áudio
 BACKGROUND_MUSIC = "assets/audio/music/theme.ogg"
 
@@ -0,0 +1,50 @@
+import pygame
+
+from src.config import scaled_ticks
+
+
+# Classe para efeitos visuais
+class Effect(pygame.sprite.Sprite):
+    # Frames compartilhados por todos os efeitos (criados uma única vez)
+    _frames = {}
+
+    def __init__(self, x=0, y=0, effect_type="sword"):
+        super().__init__()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(x, y, effect_type)
+
+    @classmethod
+    def get_frames(cls, effect_type):
+        frames = cls._frames.get(effect_type)
+        if frames is None:
+            frames = []
+            if effect_type == "sword":
+                # Cria frames para efeito de espada
+                for i in range(4):
+                    surf = pygame.Surface((40, 15), pygame.SRCALPHA)
+                    alpha = 200 - (i * 50)
+                    frames.append(surf)
+            cls._frames[effect_type] = frames
+        return frames
+
+    def reset(self, x, y, effect_type="sword"):
+        """(Re)ativa o efeito na posição indicada (usado pelo pool de sprites)"""
+        self.effect_type = effect_type
+        self.lifetime = scaled_ticks(10)
+        self.frames = self.get_frames(effect_type)
+        self.current_frame = 0
+
+        if self.frames:
+            self.image = self.frames[0]
+            self.rect = self.image.get_rect()
+            self.rect.center = (x, y)
+
+    def update(self):
+        self.lifetime -= 1
+
+        # Anima o efeito
+        if self.lifetime > 0:
+            self.current_frame = (self.current_frame + 1) % len(self.frames)
+            self.image = self.frames[self.current_frame]
+        else:
+            self.kill()
@@ -1,8 +1,13 @@
+import logging
 import pygame
 import random
 import math
-import os
-from src.animation import Animation
+from src import assets, log
+from src.animation import Clip, flashed
+from src.components import Animator, Body
+from src.config import TICK_MS, TICK_SCALE, scaled_ticks
+from src.enemy_types import ENEMY_TYPES
+from src.text import render_text
 
 # Cores para fallback
 RED = (255, 0, 0)
@@ -11,81 +16,101 @@ WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 YELLOW = (255, 255, 0)
 
+logger = logging.getLogger(__name__)
+
 
 class Enemy(pygame.sprite.Sprite):
-    def __init__(self, player):
+    CHARACTER = 'enemy'
+    STATES = ['idle', 'walk']
+    DIRECTIONS = ['down', 'up', 'left', 'right']
+    FRAME_COUNTS = {'idle': 4, 'walk': 4}
+    FRAME_DURATIONS = {'idle': 200, 'walk': 150}
+    WORLD = pygame.Rect(0, 0, 1600, 1200)
+    BOUNDS_MARGIN = 100  # Permite um pouco fora do mundo para o spawn
+    HIT_FLASH = flashed((255, 255, 255))  # Variante branca mostrada ao levar dano
+    HIT_FLASH_TICKS = scaled_ticks(6)
+    SIDES = ('top', 'right', 'bottom', 'left')
+
+    def __init__(self, player=None, rng=random, world=None, kind=None):
         super().__init__()
-        print("Inicializando Inimigo com animações multidirecionais...")
 
         # Carrega as animações
-        self.animations = self.load_animations()
-        self.current_state = 'idle'
-        self.direction = 'down'
-        self.facing = 'down'
-
-        self.image = self.animations['idle']['down'].get_current_frame()
+        self.animator = Animator(type(self))
 
         # HITBOXES REDUZIDAS - tamanho original do sprite é 128x128
-        # Hitbox principal reduzida para 60x60 (47% do tamanho original)
-        self.rect = pygame.Rect(0, 0, 60, 60)
-
-        # Hitbox de colisão ainda menor para mais precisão (40x40)
-        self.collision_rect = pygame.Rect(0, 0, 40, 40)
+        # Hitbox principal reduzida para 60x60 (47% do tamanho original) e de colisão ainda menor (40x40)
+        self.body = Body((60, 60), (40, 40))
+        self.rect = self.body.rect
+        self.collision_rect = self.body.collision_rect
 
-        self.player = player
-        self.speed = random.uniform(1.0, 3.0)
-        self.health = 30
-        self.max_health = 30
-        self.is_moving = False
+        # Campo de direções até o jogador (src.flowfield), quando o mapa tem paredes
+        self.flow = None
 
-        self.spawn()
-        print(f"Inimigo criado. Hitbox: {self.rect.size}, Collision: {self.collision_rect.size}")
+        self.reset(player, rng, world, kind)
+        log.count('enemies_created')
+        logger.debug("Inimigo criado. Hitbox: %s, Collision: %s", self.rect.size, self.collision_rect.size)
 
-    def load_animations(self):
-        """Carrega animações para todas as direções"""
-        animations = {
-            'idle': {},
-            'walk': {},
-            'attack': {}
-        }
-
-        directions = ['down', 'up', 'left', 'right']
-
-        for state in ['idle', 'walk']:
-            for direction in directions:
-                try:
-                    frames = self.load_frames(state, direction)
-                    if frames:
-                        if state == 'idle':
-                            animations[state][direction] = Animation(frames, 200)
-                        elif state == 'walk':
-                            animations[state][direction] = Animation(frames, 150)
-                        print(f"✓ Inimigo {state}_{direction}: {len(frames)} frames")
-                    else:
-                        print(f"✗ Criando fallback para inimigo {state}_{direction}")
-                        animations[state][direction] = self.create_fallback_animation(state, direction)
-                except Exception as e:
-                    print(f"❌ Erro em inimigo {state}_{direction}: {e}")
-                    animations[state][direction] = self.create_fallback_animation(state, direction)
-
-        return animations
-
-    def load_frames(self, state, direction):
-        """Carrega frames para um estado e direção específicos"""
-        frames = []
-        frame_count = 4
-
-        for i in range(frame_count):
-            frame_path = f'assets/images/enemy/{state}/{direction}/frame_{i}.png'
-            if os.path.exists(frame_path):
-                frame = pygame.image.load(frame_path).convert_alpha()
-                frame = pygame.transform.scale(frame, (128, 128))
-                frames.append(frame)
+    def reset(self, player, rng=random, world=None, kind=None, spawn=None):
+        """(Re)ativa o inimigo com nova posição, velocidade e vida (usado pelo pool de sprites).
 
-        return frames if frames else None
+        spawn (src.waves.SpawnEvent): lado, posição e velocidade já sorteados no plano da onda;
+        sem ele, são sorteados aqui com rng.
+        """
+        self.player = player
+        self.world = world or self.WORLD
+        self.bounds = self.bounds_for(self.world)
+        self.rng = rng  # random (ou random.Random com semente para partidas reproduzíveis)
+
+        # Atributos do tipo de inimigo (dados em src.enemy_types)
+        self.kind = kind or ENEMY_TYPES['grunt']
+        self.max_health = self.kind.max_health
+        # Velocidades do tipo e do plano são px por passo a 60 Hz
+        self.speed = (spawn.speed if spawn is not None else rng.uniform(*self.kind.speed)) * TICK_SCALE
+        self.variant = self.kind.variant
+        self.flash_variant = self.variant + self.HIT_FLASH if self.variant else self.HIT_FLASH
+
+        self.health = self.max_health
+        self.hit_flash = 0
+        self.is_moving = False
 
-    def create_fallback_animation(self, state, direction):
-        """Cria animação de fallback para uma direção específica"""
+        if spawn is not None:
+            self.spawn(spawn.side, spawn.offset)
+        else:
+            self.spawn(*self.roll_spawn(rng, self.world))
+
+    @property
+    def current_state(self):
+        return self.animator.state
+
+    @property
+    def direction(self):
+        return self.animator.direction
+
+    @classmethod
+    def preload(cls, loader=None):
+        """Carrega todos os frames no cache compartilhado (e o flash de dano de cada um).
+
+        Com um loader, só agenda o carregamento em segundo plano (o flash é gerado no primeiro uso).
+        """
+        if loader is not None:
+            loader.request(cls.CHARACTER, cls.STATES, cls.DIRECTIONS, cls.FRAME_COUNTS)
+            return
+        assets.preload(cls.CHARACTER, cls.STATES, cls.DIRECTIONS, cls.FRAME_COUNTS)
+        for state in cls.STATES:
+            for direction in cls.DIRECTIONS:
+                frames = assets.load_frames(cls.CHARACTER, state, direction, cls.FRAME_COUNTS[state])
+                if frames:
+                    Clip(frames).precompute([cls.HIT_FLASH])
+
+    @classmethod
+    def create_fallback_clip(cls, state, direction):
+        """Clip de fallback para uma direção específica (frames desenhados uma vez por classe)"""
+        frames = assets.fallback_frames(cls.CHARACTER, state, direction, cls.draw_fallback_frames)
+        return Clip(frames, cls.FRAME_DURATIONS[state])
+
+    @staticmethod
+    def draw_fallback_frames(state, direction):
+        """Desenha os frames de fallback (círculos e polígonos) de um estado/direção"""
         frames = []
         frame_count = 4
 
@@ -134,8 +159,13 @@ class Enemy(pygame.sprite.Sprite):
 
             frames.append(surf)
 
-        duration = 200 if state == 'idle' else 150
-        return Animation(frames, duration)
+        return frames
+
+    @classmethod
+    def bounds_for(cls, world):
+        """(esquerda, topo, direita, base) em que o inimigo pode andar num mundo"""
+        margin = cls.BOUNDS_MARGIN
+        return world.left - margin, world.top - margin, world.right + margin, world.bottom + margin
 
     def determine_direction(self, dx, dy):
         """Determina a direção baseada no movimento"""
@@ -144,80 +174,87 @@ class Enemy(pygame.sprite.Sprite):
         else:
             return 'up' if dy < 0 else 'down'
 
-    def spawn(self):
-        side = random.choice(['top', 'right', 'bottom', 'left'])
+    @classmethod
+    def roll_spawn(cls, rng, world):
+        """Sorteia (lado, deslocamento ao longo dele) para um spawn na borda do mundo"""
+        side = rng.choice(cls.SIDES)
+        return side, rng.randint(0, world.width if side in ('top', 'bottom') else world.height)
+
+    def spawn(self, side, offset):
+        """Posiciona o inimigo fora da borda side do mundo, a offset pixels do início dela"""
+        world = self.world
 
         if side == 'top':
-            self.rect.x = random.randint(0, 1600)
-            self.rect.y = -60
-            self.direction = 'down'
+            self.rect.x = world.left + offset
+            self.rect.y = world.top - 60
             self.facing = 'down'
         elif side == 'right':
-            self.rect.x = 1600 + 60
-            self.rect.y = random.randint(0, 1200)
-            self.direction = 'left'
+            self.rect.x = world.right + 60
+            self.rect.y = world.top + offset
             self.facing = 'left'
         elif side == 'bottom':
-            self.rect.x = random.randint(0, 1600)
-            self.rect.y = 1200 + 60
-            self.direction = 'up'
+            self.rect.x = world.left + offset
+            self.rect.y = world.bottom + 60
             self.facing = 'up'
         elif side == 'left':
-            self.rect.x = -60
-            self.rect.y = random.randint(0, 1200)
-            self.direction = 'right'
+            self.rect.x = world.left - 60
+            self.rect.y = world.top + offset
             self.facing = 'right'
 
+        # Olha para dentro do mundo (troca o clip junto com a direção)
+        self.animator.reset('idle', self.facing)
+        self.image = self.animator.frame(self.variant)
+
         # Centraliza a hitbox de colisão
-        self.collision_rect.center = self.rect.center
+        self.body.place(self.rect.center)
 
-    def update(self):
+    def update(self, ticks=1):
+        """Avança ticks passos de uma vez (inimigos distantes são atualizados com menos frequência)"""
         # Calcula direção para o jogador
         dx = self.player.rect.centerx - self.rect.centerx
         dy = self.player.rect.centery - self.rect.centery
 
         dist = math.sqrt(dx * dx + dy * dy)
-        self.is_moving = dist > 20
 
-        # Determina nova direção
-        old_direction = self.direction
-        self.direction = self.determine_direction(dx, dy)
-        self.facing = self.direction
+        # Com paredes, segue o campo de direções (contorna obstáculos); perto do jogador, vai reto
+        mx, my, length = dx, dy, dist
+        if self.flow is not None:
+            fx, fy = self.flow.direction(*self.rect.center)
+            if fx or fy:
+                mx, my, length = fx, fy, math.hypot(fx, fy)
 
-        # Atualiza estado da animação
-        new_state = 'walk' if self.is_moving else 'idle'
-
-        # Reseta animação se mudou de estado ou direção
-        if new_state != self.current_state or old_direction != self.direction:
-            self.current_state = new_state
-            self.animations[self.current_state][self.direction].reset()
-
-        # Atualiza animação
-        self.animations[self.current_state][self.direction].update()
-        self.image = self.animations[self.current_state][self.direction].get_current_frame()
+        # Atualiza direção e animação
+        self.set_motion(self.determine_direction(mx, my), dist > 20, TICK_MS * ticks)
 
         # Movimento em direção ao jogador
-        if dist > 0:
-            dx = dx / dist * self.speed
-            dy = dy / dist * self.speed
-            self.rect.x += dx
-            self.rect.y += dy
-
-            # Atualiza a hitbox de colisão
-            self.collision_rect.center = self.rect.center
+        if length > 0:
+            self.body.move(mx / length * self.speed * ticks, my / length * self.speed * ticks)
 
         # Mantém dentro dos limites da tela
         self.keep_in_bounds()
 
-    def keep_in_bounds(self):
-        """Mantém o inimigo dentro dos limites da tela"""
-        self.rect.left = max(-100, self.rect.left)  # Permite um pouco fora para spawn
-        self.rect.right = min(1700, self.rect.right)
-        self.rect.top = max(-100, self.rect.top)
-        self.rect.bottom = min(1300, self.rect.bottom)
+    def set_motion(self, direction, is_moving, dt=TICK_MS):
+        """Atualiza direção, estado e frame da animação (usado também pelo movimento em lote)"""
+        self.is_moving = is_moving
+        self.facing = direction
+
+        # Atualiza estado da animação (recomeça se mudou de estado ou direção)
+        animator = self.animator
+        animator.play('walk' if is_moving else 'idle', direction)
+        animator.update(dt)
+        if self.hit_flash > 0:
+            self.hit_flash = max(0, self.hit_flash - round(dt / TICK_MS))
+        self.image = animator.frame(self.flash_variant if self.hit_flash else self.variant)
+
+    def hit(self, damage):
+        """Aplica dano e pisca em branco por alguns passos"""
+        self.health -= damage
+        self.hit_flash = self.HIT_FLASH_TICKS
+        self.image = self.animator.frame(self.flash_variant)
 
-        # Atualiza hitbox de colisão
-        self.collision_rect.center = self.rect.center
+    def keep_in_bounds(self):
+        """Mantém o inimigo dentro dos limites do mundo"""
+        self.body.clamp(*self.bounds)
 
     def draw_debug(self, surface):
         """Desenha informações de debug para o inimigo"""
@@ -231,7 +268,6 @@ class Enemy(pygame.sprite.Sprite):
         pygame.draw.circle(surface, (0, 0, 255), self.rect.center, 3)
 
         # Texto com vida
-        font = pygame.font.SysFont(None, 16)
         health_text = f"HP: {self.health}"
-        text_surface = font.render(health_text, True, WHITE)
+        text_surface = render_text(health_text, 16, WHITE)
         surface.blit(text_surface, (self.rect.x, self.rect.y - 15))
\ No newline at end of file
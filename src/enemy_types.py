@@ -0,0 +1,31 @@
+"""Tipos de inimigo definidos como dados.
+
+Um tipo novo é só mais uma entrada em ENEMY_TYPES (ex.: mais rápido, com menos
+vida e frames tingidos com src.animation.tinted): todos usam a mesma classe
+Enemy, com o mesmo movimento, animação, colisão, dano e desenho.
+"""
+
+
+class EnemyType:
+    __slots__ = ('name', 'max_health', 'speed', 'contact_damage', 'score', 'variant', 'min_level', 'weight')
+
+    def __init__(self, name, max_health=30, speed=(1.0, 3.0), contact_damage=0.5, score=10, variant=None,
+                 min_level=1, weight=1):
+        self.name = name
+        self.max_health = max_health
+        self.speed = speed  # (mínima, máxima), sorteada no spawn
+        self.contact_damage = contact_damage  # dano por passo encostado no jogador
+        self.score = score  # pontos ao derrotar (mais o bônus de combo)
+        self.variant = variant  # variante dos frames (ex.: tingido), ver src.animation
+        self.min_level = min_level  # primeiro nível em que aparece
+        self.weight = weight  # chance relativa de ser sorteado entre os disponíveis
+
+
+ENEMY_TYPES = {
+    'grunt': EnemyType('grunt'),
+}
+
+
+def available_types(level):
+    """Tipos liberados até o nível (na ordem de ENEMY_TYPES)"""
+    return [kind for kind in ENEMY_TYPES.values() if kind.min_level <= level]
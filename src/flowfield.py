@@ -0,0 +1,407 @@
+"""Campo de direções (flow field) até o jogador, sobre a grade de colisão do mapa.
+
+Um BFS a partir da célula do jogador dá, para cada célula livre, o passo (dx, dy)
+para a vizinha mais próxima do alvo. Os inimigos só leem a direção da célula em
+que estão (O(1)), então o custo do pathfinding não depende de quantos inimigos há.
+
+O cálculo roda num processo separado: a posição do jogador entra e o campo sai
+por memória compartilhada (multiprocessing.shared_memory), com dois buffers para
+que o jogo nunca leia um campo pela metade. Sem multiprocessing (ou em partidas
+que precisam ser determinísticas) o mesmo cálculo roda no próprio processo,
+dividido entre os passos (FLOW_FIELD_LEVELS_PER_TICK níveis do BFS por passo):
+como no processo separado, o campo anterior vale até o novo ficar pronto.
+"""
+import atexit
+import logging
+import multiprocessing
+import struct
+from multiprocessing import shared_memory
+
+from src.config import FLOW_FIELD_LEVELS_PER_TICK
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional; só a amostragem em lote usa
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Vizinhos: ortogonais primeiro (desempate prefere andar reto)
+NEIGHBORS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+# Pedido: sequência, depois célula alvo (x, y) e parar. A sequência vale BUSY
+# enquanto o jogo escreve o resto (seqlock): o processo nunca junta sequência e alvo de pedidos diferentes
+SEQUENCE = struct.Struct('<i')
+TARGET = struct.Struct('<iii')
+REQUEST_SIZE = SEQUENCE.size + TARGET.size
+BUSY = -1
+# Cabeçalho do campo: buffer publicado (0/1, -1 = nenhum ainda), sequência do pedido atendido
+HEADER = struct.Struct('<ii')
+
+
+def compute_flow_field(solid, width, height, target, out=None):
+    """Preenche out (2 bytes com sinal por célula: dx, dy) com o passo de cada célula até target.
+
+    solid: bytes com 1 nas células bloqueadas. Células bloqueadas, inalcançáveis
+    ou o próprio alvo ficam com (0, 0). Diagonais não cortam quinas de paredes.
+    """
+    job = FlowJob(solid, width, height, target)
+    job.advance()
+    if out is None:
+        return job.field
+    out[:len(job.field)] = job.field
+    return out
+
+
+class FlowJob:
+    """Cálculo de um campo em partes: advance(n) avança n níveis do BFS (distâncias 1, 2, ...).
+
+    Com numpy, cada nível é a frente inteira de uma vez; sem, célula a célula. O
+    resultado é o mesmo, e o trabalho por chamada é limitado pelo número de níveis
+    (não pelo tempo), então dividir o cálculo entre passos continua determinístico.
+    """
+    __slots__ = ('target', 'levels', 'field', '_steps')
+
+    def __init__(self, solid, width, height, target):
+        self.target = target
+        self.levels = 0  # níveis já calculados
+        self.field = None  # bytes do campo quando terminar
+        levels = _numpy_levels if np is not None else _python_levels
+        self._steps = levels(solid, width, height, target)
+
+    def advance(self, budget=None):
+        """Calcula até budget níveis (None = até o fim); True quando o campo está pronto"""
+        while self.field is None and (budget is None or budget > 0):
+            try:
+                next(self._steps)
+            except StopIteration as done:
+                self.field = done.value
+                break
+            self.levels += 1
+            if budget is not None:
+                budget -= 1
+        return self.field is not None
+
+
+def _python_levels(solid, width, height, target):
+    """BFS célula a célula, um nível por yield; retorna o campo"""
+    count = width * height
+    tx, ty = target
+    distance = [-1] * count
+    if 0 <= tx < width and 0 <= ty < height and not solid[ty * width + tx]:
+        distance[ty * width + tx] = 0
+        frontier = [(tx, ty)]
+        d = 0
+        while frontier:
+            d += 1
+            reached = []
+            for x, y in frontier:
+                for dx, dy in NEIGHBORS:
+                    nx, ny = x + dx, y + dy
+                    if not (0 <= nx < width and 0 <= ny < height):
+                        continue
+                    i = ny * width + nx
+                    if distance[i] != -1 or solid[i]:
+                        continue
+                    if dx and dy and (solid[y * width + nx] or solid[ny * width + x]):
+                        continue
+                    distance[i] = d
+                    reached.append((nx, ny))
+            frontier = reached
+            yield
+
+    out = bytearray(count * 2)
+    for y in range(height):
+        row = y * width
+        for x in range(width):
+            i = row + x
+            best = distance[i]
+            step = (0, 0)
+            if best > 0:
+                for dx, dy in NEIGHBORS:
+                    nx, ny = x + dx, y + dy
+                    if not (0 <= nx < width and 0 <= ny < height):
+                        continue
+                    d = distance[ny * width + nx]
+                    if d == -1 or d >= best:
+                        continue
+                    if dx and dy and (solid[y * width + nx] or solid[ny * width + x]):
+                        continue
+                    best, step = d, (dx, dy)
+            out[i * 2] = step[0] & 0xFF
+            out[i * 2 + 1] = step[1] & 0xFF
+    return bytes(out)
+
+
+def _numpy_levels(solid, width, height, target):
+    """BFS por frentes (numpy), um nível por yield; retorna o campo"""
+    w, h = width, height
+    # Grade com borda bloqueada: vizinhos fora do mapa não precisam de teste de limite
+    free = np.zeros((h + 2, w + 2), dtype=bool)
+    free[1:-1, 1:-1] = np.frombuffer(bytes(solid), dtype=np.uint8, count=w * h).reshape(h, w) == 0
+
+    def around(grid, dx, dy):
+        """Vista de grid em que cada célula do mapa enxerga a célula (x + dx, y + dy)"""
+        return grid[1 + dy:h + 1 + dy, 1 + dx:w + 1 + dx]
+
+    # Por direção: células do mapa em que se pode entrar andando nela (diagonal sem cortar quina)
+    enter = []
+    for dx, dy in NEIGHBORS:
+        allowed = free[1:-1, 1:-1].copy()
+        if dx and dy:
+            allowed &= around(free, -dx, 0) & around(free, 0, -dy)
+        enter.append((dx, dy, allowed))
+
+    distance = np.full((h + 2, w + 2), -1, dtype=np.int32)
+    tx, ty = target
+    if 0 <= tx < w and 0 <= ty < h and free[ty + 1, tx + 1]:
+        distance[ty + 1, tx + 1] = 0
+        frontier = np.zeros((h + 2, w + 2), dtype=bool)
+        frontier[ty + 1, tx + 1] = True
+        unvisited = free[1:-1, 1:-1].copy()
+        unvisited[ty, tx] = False
+        reached = np.empty((h, w), dtype=bool)
+        entered = np.empty((h, w), dtype=bool)
+        d = 0
+        while True:
+            d += 1
+            reached[:] = False
+            for dx, dy, allowed in enter:
+                np.logical_and(around(frontier, -dx, -dy), allowed, out=entered)
+                reached |= entered
+            reached &= unvisited
+            if not reached.any():
+                break
+            distance[1:-1, 1:-1][reached] = d
+            unvisited &= ~reached
+            frontier[1:-1, 1:-1] = reached
+            yield
+
+    # Passo de cada célula: a primeira vizinha (na ordem de NEIGHBORS) com a menor distância
+    own = distance[1:-1, 1:-1]
+    best = own.copy()
+    steps = np.zeros((h, w, 2), dtype=np.int8)
+    for dx, dy in NEIGHBORS:
+        neighbor = around(distance, dx, dy)
+        better = (own > 0) & (neighbor != -1) & (neighbor < best)
+        if dx and dy:
+            better &= around(free, dx, 0) & around(free, 0, dy)
+        best[better] = neighbor[better]
+        steps[better] = (dx, dy)
+    return steps.tobytes()
+
+
+def _write_request(buf, sequence, tx, ty, stop=0):
+    SEQUENCE.pack_into(buf, 0, BUSY)
+    TARGET.pack_into(buf, SEQUENCE.size, tx, ty, stop)
+    SEQUENCE.pack_into(buf, 0, sequence)
+
+
+def _read_request(buf):
+    """(sequência, tx, ty, parar) de um mesmo pedido; repete se o jogo escreveu no meio da leitura"""
+    while True:
+        sequence, = SEQUENCE.unpack_from(buf)
+        if sequence == BUSY:
+            continue
+        tx, ty, stop = TARGET.unpack_from(buf, SEQUENCE.size)
+        if SEQUENCE.unpack_from(buf)[0] == sequence:
+            return sequence, tx, ty, stop
+
+
+def _worker(request_name, field_name, solid, width, height, wake):
+    """Processo do pathfinding: recalcula o campo a cada alvo novo e publica no buffer livre"""
+    request = shared_memory.SharedMemory(name=request_name)
+    field = shared_memory.SharedMemory(name=field_name)
+    size = width * height * 2
+    served = -1
+    try:
+        while True:
+            wake.wait()
+            wake.clear()
+            sequence, tx, ty, stop = _read_request(request.buf)
+            if stop:
+                break
+            if sequence == served:
+                continue
+            published, _ = HEADER.unpack_from(field.buf)
+            back = 1 if published == 0 else 0
+            start = HEADER.size + back * size
+            field.buf[start:start + size] = compute_flow_field(solid, width, height, (tx, ty))
+            HEADER.pack_into(field.buf, 0, back, sequence)
+            served = sequence
+    finally:
+        request.close()
+        field.close()
+
+
+class FlowField:
+    """Campo de direções sobre uma CollisionGrid.
+
+    use_process=True calcula num processo separado (o campo chega alguns frames
+    depois); False calcula no próprio processo, levels_per_tick níveis do BFS por
+    passo (determinístico). Só o primeiro campo sai inteiro de uma vez.
+    """
+
+    def __init__(self, grid, use_process=True, levels_per_tick=FLOW_FIELD_LEVELS_PER_TICK):
+        self.grid = grid
+        self.width = grid.width
+        self.height = grid.height
+        self.cell_width = grid.tile_width
+        self.cell_height = grid.tile_height
+        self.size = self.width * self.height * 2
+        self.target = None
+        self.sequence = 0
+        self.process = None
+        self.levels_per_tick = levels_per_tick
+        self.job = None  # cálculo em andamento no próprio processo (FlowJob)
+        self.field_target = None  # célula alvo do campo publicado no próprio processo
+
+        if use_process:
+            try:
+                self._start_process()
+            except (OSError, ValueError, ImportError) as e:
+                logger.warning("❌ Pathfinding em processo separado indisponível (%s); calculando no jogo", e)
+                self.process = None
+        if self.process is None:
+            self.field = bytearray(self.size)
+            self.ready = False
+
+    def _start_process(self):
+        self.request = shared_memory.SharedMemory(create=True, size=REQUEST_SIZE)
+        self.shared = shared_memory.SharedMemory(create=True, size=HEADER.size + 2 * self.size)
+        _write_request(self.request.buf, 0, 0, 0)
+        HEADER.pack_into(self.shared.buf, 0, -1, -1)
+
+        context = multiprocessing.get_context('spawn')
+        self.wake = context.Event()
+        self.process = context.Process(
+            target=_worker, name='flowfield', daemon=True,
+            args=(self.request.name, self.shared.name, bytes(self.grid.cells), self.width, self.height, self.wake))
+        self.process.start()
+        atexit.register(self.close)
+        logger.info("✓ Pathfinding em processo separado (%dx%d células)", self.width, self.height)
+
+    # ------------------------------------------------------------------
+    # Alvo
+    # ------------------------------------------------------------------
+    def cell_at(self, x, y):
+        return int(x // self.cell_width), int(y // self.cell_height)
+
+    def set_target(self, x, y):
+        """Atualiza a posição do jogador (chamado a cada passo); recalcula quando ele muda de célula"""
+        cell = self.cell_at(x, y)
+        if cell != self.target:
+            self.target = cell
+            self.sequence += 1
+            if self.process is not None and not self.process.is_alive():
+                logger.error("❌ Processo de pathfinding parou; calculando no jogo")
+                self.close()
+            if self.process is not None:
+                _write_request(self.request.buf, self.sequence, cell[0], cell[1])
+                self.wake.set()
+        if self.process is None:
+            self._advance()
+
+    def _advance(self):
+        """Avança o cálculo no próprio processo e publica o campo quando ele termina"""
+        if self.job is None:
+            if self.target == self.field_target:
+                return
+            self.job = FlowJob(self.grid.cells, self.width, self.height, self.target)
+        # Sem campo ainda (início, processo que parou) não há o que usar enquanto isso: calcula tudo
+        if self.job.advance(self.levels_per_tick if self.ready else None):
+            self.field[:] = self.job.field
+            self.field_target = self.job.target
+            self.ready = True
+            self.job = None
+
+    # ------------------------------------------------------------------
+    # Snapshot (src.snapshot)
+    # ------------------------------------------------------------------
+    def dump(self):
+        """Estado do cálculo no próprio processo (None com processo separado, que não é determinístico)"""
+        if self.process is not None:
+            return None
+        return {'target': self.target, 'field_target': self.field_target if self.ready else None,
+                'job': [self.job.target, self.job.levels] if self.job is not None else None}
+
+    def load(self, data):
+        """Refaz o campo publicado e o cálculo em andamento de dump().
+
+        Retorna False se não havia o que restaurar: o alvo fica vazio e o próximo
+        set_target recomeça o cálculo.
+        """
+        self.job = None
+        self.ready = False
+        self.field_target = None
+        self.target = None
+        if data is None or self.process is not None:
+            return False
+        if data['field_target'] is not None:
+            self.field[:] = compute_flow_field(self.grid.cells, self.width, self.height,
+                                               tuple(data['field_target']))
+            self.field_target = tuple(data['field_target'])
+            self.ready = True
+        if data['job'] is not None:
+            target, levels = data['job']
+            self.job = FlowJob(self.grid.cells, self.width, self.height, tuple(target))
+            self.job.advance(levels)
+        self.target = tuple(data['target']) if data['target'] is not None else None
+        return True
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def _buffer(self):
+        """(buffer, deslocamento) do campo publicado, ou None se ainda não há campo"""
+        if self.process is None:
+            return (self.field, 0) if self.ready else None
+        published, _ = HEADER.unpack_from(self.shared.buf)
+        if published < 0:
+            return None
+        return self.shared.buf, HEADER.size + published * self.size
+
+    def direction(self, x, y):
+        """Passo (dx, dy) em -1..1 da célula que contém o ponto; (0, 0) fora do mapa ou sem campo"""
+        cx, cy = int(x // self.cell_width), int(y // self.cell_height)
+        if not (0 <= cx < self.width and 0 <= cy < self.height):
+            return 0, 0
+        found = self._buffer()
+        if found is None:
+            return 0, 0
+        buffer, offset = found
+        i = offset + (cy * self.width + cx) * 2
+        dx, dy = buffer[i], buffer[i + 1]
+        return (dx - 256 if dx > 127 else dx), (dy - 256 if dy > 127 else dy)
+
+    def directions(self, positions):
+        """Versão em lote (numpy): array (n, 2) de posições -> array (n, 2) de passos"""
+        result = np.zeros((len(positions), 2))
+        found = self._buffer()
+        if found is None:
+            return result
+        buffer, offset = found
+        field = np.frombuffer(buffer, dtype=np.int8, count=self.size, offset=offset).reshape(self.height,
+                                                                                           self.width, 2)
+        cx = np.floor_divide(positions[:, 0], self.cell_width).astype(int)
+        cy = np.floor_divide(positions[:, 1], self.cell_height).astype(int)
+        inside = (cx >= 0) & (cx < self.width) & (cy >= 0) & (cy < self.height)
+        result[inside] = field[cy[inside], cx[inside]]
+        return result
+
+    def close(self):
+        if self.process is None:
+            return
+        _write_request(self.request.buf, self.sequence, 0, 0, stop=1)
+        self.wake.set()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+        self.request.close()
+        self.request.unlink()
+        self.shared.close()
+        self.shared.unlink()
+        self.field = bytearray(self.size)
+        self.ready = False
+        self.field_target = None
@@ -0,0 +1,744 @@
+import gc
+import logging
+import os
+import random
+import time
+import pygame
+
+from src import collision, log, snapshot, steering, systems
+from src.camera import Camera
+from src.config import (SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TITLE, TICK_MS, MAX_FRAME_TIME, TIME_SCALE,
+                        ENEMY_POOL_SIZE, EFFECT_POOL_SIZE, MAP_FILE, CAMERA_DRAW_MARGIN, CAMERA_ACTIVE_MARGIN,
+                        FAR_UPDATE_INTERVAL, ASSET_WORKERS, ASSET_POLL_BUDGET_MS, LOADING_SCREEN_MAX_MS, CHECKPOINT_FILE,
+                        TICK_SCALE, scaled_ticks, get_map_path, BLACK, WHITE, YELLOW)
+from src.effects import Effect
+from src.enemy import Enemy
+from src.enemy_types import available_types
+from src.flowfield import FlowField
+from src.input import KeyboardInput
+from src.loader import AssetLoader
+from src.player import Player
+from src.pool import SpritePool
+from src.profiler import FrameProfiler
+from src.renderer import Renderer, health_bar_fill, health_bar_strip, health_bar_surface
+from src.spatial_hash import SpatialHash
+from src.text import render_text
+from src.tilemap import load_map
+from src.waves import WaveScheduler
+
+
+logger = logging.getLogger(__name__)
+
+# Barra de vida sobre cada inimigo
+ENEMY_BAR_WIDTH = 75
+ENEMY_BAR_HEIGHT = 10
+
+
+def _texture_id(op):
+    """Chave de ordenação de (surface, posição): junta os blits do mesmo frame"""
+    return id(op[0])
+
+
+def create_screen(headless=False):
+    """Inicializa o Pygame e cria a janela.
+
+    Em modo headless usa o driver de vídeo "dummy" do SDL (sem janela nem GPU);
+    a superfície ainda existe porque convert_alpha() precisa de um display.
+    """
+    if headless:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(TITLE)
+    return screen
+
+
+# Funções de desenho
+def draw_text(surface, text, size, x, y, color=WHITE, static=False):
+    text_surface = render_text(text, size, color, static=static)
+    text_rect = text_surface.get_rect()
+    text_rect.midtop = (x, y)
+    surface.blit(text_surface, text_rect)
+
+
+class Game:
+    """Estado e loop do jogo, separados da janela para poder rodar sem display.
+
+    - seed: semente do random usado no spawn/velocidade dos inimigos
+    - input_source: KeyboardInput (padrão), ScriptedInput ou, de src.replay, RecordingInput/ReplayInput
+    - batch_steering: movimento, animação e dano por contato dos inimigos em lote com numpy
+      (padrão: se estiver instalado)
+    - map_path: mapa .tmx (None = arena padrão do tamanho da tela)
+    - async_assets: carrega as imagens em segundo plano, com tela de carregamento em run()
+    - async_pathfinding: calcula o campo de direções dos inimigos num processo separado
+      (senão, no próprio passo da simulação, de forma determinística)
+    """
+
+    def __init__(self, screen, seed=None, input_source=None, batch_steering=None, map_path=MAP_FILE,
+                 async_assets=False, async_pathfinding=False):
+        self.screen = screen
+        self.renderer = Renderer(screen)
+        self.clock = pygame.time.Clock()
+        self.seed = seed
+        self.input = input_source or KeyboardInput()
+        self.batch_steering = steering.available() if batch_steering is None else batch_steering
+
+        # Mapa: define os limites do mundo, os tiles sólidos e o fundo
+        self.map_path = map_path
+        self.tilemap = load_map(get_map_path(map_path)) if map_path else None
+        if self.tilemap is not None:
+            self.world = self.tilemap.rect
+            self.solid = self.tilemap.collision
+        else:
+            self.world = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+            self.solid = None
+
+        # Pathfinding dos inimigos: só faz sentido se o mapa tem paredes
+        if self.solid is not None and any(self.solid.cells):
+            self.flow = FlowField(self.solid, use_process=async_pathfinding)
+        else:
+            self.flow = None
+
+        # Câmera: o que é desenhado e quais inimigos recebem atualização completa
+        self.camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT, self.world, CAMERA_DRAW_MARGIN, CAMERA_ACTIVE_MARGIN)
+        left, top, right, bottom = Enemy.bounds_for(self.world)
+        self.enemy_region = pygame.Rect(left, top, right - left, bottom - top)
+        self.view = self.camera.rect.copy()  # visão do último frame desenhado
+        self.build_background()
+
+        # Overlay do game over (pré-renderizado uma vez)
+        self.game_over_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.game_over_overlay.fill((0, 0, 0, 180))
+
+        # Variáveis de debug
+        self.show_debug = False  # Tecla F1 para mostrar/ocultar debug
+        self.show_profiler = False  # Tecla F2: gráfico de tempo por fase
+
+        # Tempo de cada fase do loop (F3 grava trace/CSV, F4 roda o cProfile na fase mais lenta)
+        self.profiler = FrameProfiler()
+
+        # Spawn automático pelas ondas de src.waves (benchmarks desligam para manter a contagem fixa)
+        self.auto_spawn = True
+
+        # Carrega os frames uma única vez; cada sprite só cria seus próprios cursores de Animation.
+        # Em segundo plano, os sprites começam com fallbacks e trocam quando os frames chegam
+        self.loader = AssetLoader(ASSET_WORKERS) if async_assets else None
+        Player.preload(self.loader)
+        Enemy.preload(self.loader)
+
+        # Sprites pré-alocados, reaproveitados entre ondas e entre partidas
+        # (com carregamento em segundo plano o pool é preenchido quando as imagens chegam,
+        # para não criar fallbacks de inimigos que ainda nem apareceram)
+        self.enemy_pool = SpritePool(Enemy, size=0 if self.loader is not None else ENEMY_POOL_SIZE)
+        self.effect_pool = SpritePool(Effect, size=EFFECT_POOL_SIZE)
+        self.enemies = None
+
+        self.reset()
+
+        # Estado inicial (reinício com R) e checkpoint (F5/F9), restaurados sem recarregar nada
+        self.initial_snapshot = snapshot.capture(self)
+        self.checkpoint = None
+        self.restarts = 0
+
+        # Heap congelado por freeze_heap() (desfeito em close())
+        self.frozen = False
+
+    def reset(self):
+        """Começa uma partida nova"""
+        self.rng = random.Random(self.seed)
+
+        # Devolve ao pool os sprites da partida anterior
+        if self.enemies is not None:
+            self.enemy_pool.release_all(self.enemies)
+            self.effect_pool.release_all(self.effects)
+
+        # Cria o jogador (no objeto "player" do mapa, se houver)
+        start = self.tilemap.find_object('player') if self.tilemap is not None else None
+        x, y = start['rect'].center if start is not None else self.world.center
+        self.player = Player(x, y, self.world, self.solid)
+        self.camera.follow(self.player.rect.center)
+
+        # Grupos de sprites
+        self.all_sprites = pygame.sprite.Group()
+        self.enemies = pygame.sprite.Group()
+        self.effects = pygame.sprite.Group()
+
+        self.all_sprites.add(self.player)
+        self.enemy_pool.groups = (self.all_sprites, self.enemies)
+        self.effect_pool.groups = (self.all_sprites, self.effects)
+
+        # Grade espacial com as hitboxes de colisão dos inimigos (broad phase)
+        self.enemy_grid = SpatialHash(cell_size=128)
+        # Inimigos já atingidos pelo golpe atual
+        self.sword_hits = collision.HitRegistry()
+
+        # Movimento, animação e dano por contato vetorizados, nos mesmos arrays
+        # (None = cada inimigo se atualiza sozinho)
+        if self.batch_steering:
+            self.enemy_steering = steering.SteeringSystem(Enemy.bounds_for(self.world))
+            self.enemy_animation = systems.AnimationSystem(self.enemy_steering, Enemy)
+            self.enemy_contact = systems.ContactSystem(self.enemy_steering)
+        else:
+            self.enemy_steering = self.enemy_animation = self.enemy_contact = None
+
+        # Variáveis do jogo
+        self.game_over = False
+        self.score = 0
+        self.level = 1
+        self.enemies_defeated = 0
+        self.combo_counter = 0
+        self.combo_timer = 0
+        self.enemies_spawned = 0
+
+        # Plano de spawn da onda (sorteado com o random da partida); derrotar a onda toda passa de nível
+        self.waves = WaveScheduler(self.rng, self.world)
+        self.enemies_per_level = self.waves.start(self.level, 0)
+
+        # Passo fixo da simulação
+        self.tick = 0
+        self.accumulator = 0.0
+        self.sim_time = 0.0
+        self.previous_positions = {}
+        # Maior deslocamento (px, em x ou y) de um inimigo no passo: folga das buscas na grade
+        self.enemy_step = 0
+
+        self.running = True
+
+    # ------------------------------------------------------------------
+    # Simulação
+    # ------------------------------------------------------------------
+    def spawn_enemy(self, kind=None, spawn=None):
+        """Ativa um inimigo do pool.
+
+        kind (EnemyType) é sorteado entre os tipos liberados no nível se não for dado;
+        spawn (src.waves.SpawnEvent) traz posição e velocidade já sorteadas no plano da onda.
+        """
+        if kind is None:
+            kinds = available_types(self.level)
+            kind = kinds[0] if len(kinds) == 1 else self.rng.choices(kinds, [k.weight for k in kinds])[0]
+        enemy = self.enemy_pool.acquire(self.player, self.rng, self.world, kind, spawn)
+        enemy.flow = self.flow
+        enemy.update_phase = self.enemies_spawned % FAR_UPDATE_INTERVAL
+        self.enemies_spawned += 1
+        log.count('enemy_spawns')
+        logger.debug("Spawn %s em %s", kind.name, enemy.rect.center)
+        if self.enemy_steering is not None:
+            self.enemy_steering.add(enemy)
+        return enemy
+
+    def kill_enemy(self, enemy):
+        self.enemy_pool.release(enemy)
+        self.enemy_grid.remove(enemy)
+        self.sword_hits.forget(enemy)
+        if self.enemy_steering is not None:
+            self.enemy_steering.remove(enemy)
+
+    def spawn_attack_effect(self):
+        # Cria efeito visual da espada
+        player = self.player
+        if player.facing == "right":
+            effect_x = player.rect.right + 15
+        else:
+            effect_x = player.rect.left - 15
+        self.effect_pool.acquire(effect_x, player.rect.centery, "sword")
+
+    def step(self):
+        """Avança a simulação um passo fixo (TICK_MS)"""
+        self.tick += 1
+        self.sim_time += TICK_MS
+
+        # Guarda as posições anteriores para interpolar no desenho
+        self.previous_positions = {sprite: sprite.rect.topleft for sprite in self.all_sprites}
+
+        keys, attack = self.input.read(self.tick)
+
+        if self.game_over:
+            if keys[pygame.K_r]:
+                self.restart()
+            return
+
+        player = self.player
+        profiler = self.profiler
+
+        with profiler.section('player'):
+            if attack and player.attack():
+                self.spawn_attack_effect()
+
+            # Atualiza combo timer
+            if self.combo_timer > 0:
+                self.combo_timer -= 1
+            else:
+                self.combo_counter = 0
+
+            # Atualiza
+            player.update(keys)
+            self.camera.follow(player.rect.center)
+            if self.flow is not None:
+                self.flow.set_target(*player.rect.center)
+
+        with profiler.section('enemies'):
+            # Spawns vencidos do plano da onda (poucos por passo)
+            if self.auto_spawn:
+                self.waves.update(self.sim_time, len(self.enemies), self.spawn_enemy)
+
+            # Atualiza inimigos e a posição deles na grade. Perto da câmera: todo passo;
+            # longe: a cada FAR_UPDATE_INTERVAL passos, com o movimento acumulado
+            active = self.camera.active_rect()
+            if self.enemy_steering is not None:
+                # Mundo pequeno (a área ativa cobre tudo): sem faixa distante
+                if active.contains(self.enemy_region):
+                    bounds = None
+                else:
+                    bounds = (active.left, active.top, active.right, active.bottom)
+                moved = self.enemy_steering.step(player.rect.center, bounds, self.tick, FAR_UPDATE_INTERVAL,
+                                                 self.flow)
+                if moved:
+                    self.enemy_animation.step(*self.enemy_steering.motion)
+                for enemy in moved:
+                    self.enemy_grid.update(enemy, enemy.collision_rect)
+                self.enemy_step = self.enemy_steering.max_step()
+            else:
+                previous = self.previous_positions
+                step = 0
+                for enemy in self.enemies:
+                    if active.collidepoint(enemy.rect.center):
+                        enemy.update()
+                    elif (self.tick + enemy.update_phase) % FAR_UPDATE_INTERVAL == 0:
+                        enemy.update(FAR_UPDATE_INTERVAL)
+                    else:
+                        continue
+                    self.enemy_grid.update(enemy, enemy.collision_rect)
+                    start = previous.get(enemy)
+                    if start is not None:
+                        step = max(step, abs(enemy.rect.x - start[0]), abs(enemy.rect.y - start[1]))
+                self.enemy_step = step
+
+            # Atualiza efeitos
+            for effect in self.effects:
+                effect.update()
+                if not effect.alive():
+                    self.effect_pool.release(effect)
+
+        with profiler.section('collisions'):
+            self.resolve_collisions()
+
+    def previous_rect(self, sprite):
+        """Hitbox de colisão do sprite no início do passo (antes de se mover)"""
+        previous = self.previous_positions.get(sprite)
+        if previous is None:
+            return sprite.collision_rect
+        return sprite.collision_rect.move(previous[0] - sprite.rect.x, previous[1] - sprite.rect.y)
+
+    def swept_rect(self, sprite):
+        """Área coberta pela hitbox de colisão do sprite durante o passo"""
+        before = self.previous_rect(sprite)
+        return collision.sweep_rect(before, sprite.collision_rect.x - before.x, sprite.collision_rect.y - before.y)
+
+    def resolve_collisions(self):
+        """Dano da espada, dano por contato e progressão de nível.
+
+        Os testes cobrem o movimento do passo inteiro (src.collision): nem um inimigo
+        rápido nem um passo longo (30 Hz) atravessam a espada ou o jogador sem colidir.
+        """
+        player = self.player
+        # A grade tem a posição atual: a busca cobre também onde o inimigo estava no início do passo
+        reach = 2 * self.enemy_step
+
+        # COLISÃO ATAQUE-PLAYER (lâmina varrendo o arco do golpe)
+        sweep = player.get_sword_sweep()
+        if sweep is not None:
+            hits = self.sword_hits
+            attack_id = player.attack_id
+            for enemy in self.enemy_grid.query(collision.arc_bounds(*sweep).inflate(reach, reach)):
+                # Cada golpe acerta um inimigo uma vez só: quem já levou dano nem é testado
+                if hits.hit(attack_id, enemy):
+                    continue
+                # Acerta o inimigo em qualquer ponto entre a posição anterior e a atual
+                if not collision.arc_sweep_hits(*sweep, self.swept_rect(enemy)):
+                    continue
+                hits.register(attack_id, enemy)
+                enemy.hit(player.attack_damage)
+                if self.enemy_animation is not None:
+                    self.enemy_animation.flash(enemy)
+                self.combo_counter += 1
+                self.combo_timer = scaled_ticks(60)
+
+                if enemy.health <= 0:
+                    self.score += enemy.kind.score + (self.combo_counter * 2)
+                    self.enemies_defeated += 1
+                    self.kill_enemy(enemy)
+
+        # COLISÃO INIMIGO-PLAYER (hitboxes de colisão, em movimento relativo ao jogador)
+        player_before = self.previous_rect(player)
+        pdx = player.collision_rect.x - player_before.x
+        pdy = player.collision_rect.y - player_before.y
+        if self.enemy_contact is not None:
+            damage = self.enemy_contact.damage(player_before, pdx, pdy)
+            if damage:
+                player.health -= damage * TICK_SCALE
+                if player.health <= 0:
+                    self.game_over = True
+        else:
+            area = collision.sweep_rect(player_before, pdx, pdy).inflate(reach, reach)
+            for enemy in self.enemy_grid.query(area):
+                before = self.previous_rect(enemy)
+                dx = enemy.collision_rect.x - before.x - pdx
+                dy = enemy.collision_rect.y - before.y - pdy
+                if collision.swept_aabb(before, dx, dy, player_before) is None:
+                    continue
+                player.health -= enemy.kind.contact_damage * TICK_SCALE
+                if player.health <= 0:
+                    self.game_over = True
+
+        # Aumenta a dificuldade
+        if self.enemies_defeated >= self.enemies_per_level:
+            self.level += 1
+            self.enemies_defeated = 0
+            self.enemies_per_level = self.waves.start(self.level, self.sim_time)
+
+    def restart(self):
+        """Nova partida a partir do estado inicial, reaproveitando imagens, jogador e pools"""
+        start = time.perf_counter()
+        self.restarts += 1
+        snapshot.restore(self, self.initial_snapshot)
+        # Sem semente, cada partida é diferente; com semente, a sequência continua reproduzível
+        self.rng.seed(None if self.seed is None else self.seed + self.restarts)
+        self.enemies_per_level = self.waves.start(self.level, self.sim_time)
+        logger.info("✓ Partida reiniciada em %.1f ms", (time.perf_counter() - start) * 1000)
+
+    def save_checkpoint(self, path=CHECKPOINT_FILE):
+        """Guarda o estado atual em memória e em disco"""
+        self.checkpoint = snapshot.capture(self)
+        try:
+            snapshot.save(self.checkpoint, path)
+        except (OSError, ValueError, TypeError) as e:
+            logger.error("❌ Erro ao salvar checkpoint %s (fica só em memória): %s", path, e)
+            return
+        logger.info("✓ Checkpoint salvo em %s (passo %d)", path, self.tick)
+
+    def load_checkpoint(self, path=CHECKPOINT_FILE):
+        """Volta ao último checkpoint (o da memória ou, se não houver, o do disco)"""
+        if not self.input.checkpoint_loads:
+            logger.warning("✗ Checkpoints não podem ser carregados durante gravação ou replay")
+            return
+        try:
+            checkpoint = self.checkpoint if self.checkpoint is not None else snapshot.load(path)
+        except (OSError, ValueError) as e:
+            logger.error("❌ Erro ao carregar checkpoint %s: %s", path, e)
+            return
+        # Um checkpoint com dados errados pode falhar no meio da restauração: volta ao estado de antes
+        backup = snapshot.capture(self)
+        try:
+            snapshot.restore(self, checkpoint)
+        except (ValueError, KeyError, TypeError, IndexError, AttributeError) as e:
+            logger.error("❌ Erro ao carregar checkpoint %s: %s", path, e)
+            snapshot.restore(self, backup)
+            return
+        self.checkpoint = checkpoint
+        logger.info("✓ Checkpoint carregado (passo %d)", self.tick)
+
+    def advance(self, elapsed):
+        """Acumula tempo real e roda quantos passos fixos couberem.
+
+        Se o frame atrasou, roda vários passos em vez de deixar o jogo mais lento.
+        """
+        self.accumulator += min(elapsed, MAX_FRAME_TIME) * TIME_SCALE
+        while self.accumulator >= TICK_MS and not self.input.finished:
+            self.accumulator -= TICK_MS
+            self.step()
+
+    def run_ticks(self, ticks, render=False):
+        """Roda a simulação o mais rápido possível (sem esperar o relógio)"""
+        profiler = self.profiler
+        for _ in range(ticks):
+            profiler.begin_frame()
+            self.step()
+            self.prepare_spawns()
+            if render:
+                self.render()
+            profiler.end_frame()
+
+    def prepare_spawns(self):
+        """Cria aos poucos, fora da simulação, os sprites que a onda ainda vai precisar"""
+        if self.auto_spawn and self.loader is None:
+            self.waves.prepare(self.enemy_pool, len(self.enemies))
+
+    # ------------------------------------------------------------------
+    # Eventos
+    # ------------------------------------------------------------------
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    self.running = False
+                elif event.key == pygame.K_F1:  # Tecla F1 para debug
+                    self.show_debug = not self.show_debug
+                    logger.info("Debug mode: %s", self.show_debug)
+                elif event.key == pygame.K_F2:
+                    self.show_profiler = not self.show_profiler
+                elif event.key == pygame.K_F3:
+                    if self.profiler.tracing:
+                        self.profiler.stop_trace()
+                        self.profiler.dump_csv()
+                    else:
+                        self.profiler.start_trace()
+                        logger.info("Gravando trace... (F3 para salvar)")
+                elif event.key == pygame.K_F4:
+                    self.profiler.profile_phase(self.profiler.worst_phase())
+                elif event.key == pygame.K_F5:
+                    self.save_checkpoint()
+                elif event.key == pygame.K_F9:
+                    self.load_checkpoint()
+            self.input.handle_event(event)
+
+    # ------------------------------------------------------------------
+    # Desenho
+    # ------------------------------------------------------------------
+    def build_background(self):
+        """Cria o fundo do renderer para a visão atual"""
+        background = pygame.Surface(self.screen.get_size())
+        self.draw_background(background)
+        self.renderer.set_background(background)
+
+    def draw_background(self, surface):
+        """Chunks do mapa visíveis na câmera (ou preto, sem mapa)"""
+        if self.tilemap is None:
+            surface.fill(BLACK)
+            return
+        surface.fill(self.tilemap.background_color)
+        self.tilemap.draw(surface, self.view)
+
+    def interpolate(self, sprite, alpha):
+        """Posição de desenho (no mundo) entre o passo anterior e o atual da simulação"""
+        x, y = sprite.rect.topleft
+        previous = self.previous_positions.get(sprite)
+        if previous is None:
+            return x, y
+        px, py = previous
+        return round(px + (x - px) * alpha), round(py + (y - py) * alpha)
+
+    def update_view(self, alpha):
+        """Centraliza a visão no jogador interpolado; se ela andou, refaz o fundo"""
+        player = self.player
+        x, y = self.interpolate(player, alpha)
+        view = self.camera.view_rect((x + player.rect.width // 2, y + player.rect.height // 2))
+        if view != self.view:
+            self.view = view
+            self.renderer.update_background(self.draw_background)
+        return view
+
+    def render(self, alpha=1.0):
+        """Desenha o frame e envia só as áreas que mudaram"""
+        screen = self.screen
+        player = self.player
+        renderer = self.renderer
+        profiler = self.profiler
+
+        # Visão da câmera neste frame (o fundo rola junto: frame completo)
+        view = self.update_view(alpha)
+        ox, oy = view.topleft
+        camera = self.camera
+
+        # Overlays de tela inteira (debug, perfil, game over) pedem um frame completo
+        renderer.begin(full=self.show_debug or self.show_profiler or self.game_over)
+
+        with profiler.section('hud'):
+            # Declara a UI antes dos sprites (em cache: só o que mudou é redesenhado)
+            renderer.hud_health_bar('health', 10, 10, player.health, 200, 20)
+            renderer.hud_text('health_text', f"Vida: {int(player.health)}/{player.max_health}", 24, 270, 12)
+            renderer.hud_text('score', f"Score: {self.score}", 24, SCREEN_WIDTH - 50, 10)
+            renderer.hud_text('level', f"Level: {self.level}", 24, SCREEN_WIDTH - 50, 40)
+            renderer.hud_text('defeated', f"Inimigos: {self.enemies_defeated}/{self.enemies_per_level}", 24,
+                              SCREEN_WIDTH - 70, 1170)
+
+            # Combo counter
+            combo_text = f"COMBO x{self.combo_counter}!" if self.combo_counter > 1 else None
+            renderer.hud_text('combo', combo_text, 32, SCREEN_WIDTH // 2, 10, YELLOW)
+
+            # Instruções
+            renderer.hud_text('instructions', "WASD: Mover | Espaço: Atacar", 20, SCREEN_WIDTH // 2,
+                              SCREEN_HEIGHT - 30, static=True)
+
+        with profiler.section('draw'):
+            # Sprites visíveis na posição interpolada, numa só chamada blits(): por camada
+            # (jogador, inimigos, efeitos) e, dentro dela, agrupados pelo frame compartilhado
+            interpolate = self.interpolate
+            batch = []
+            if camera.visible(player.rect, view):
+                x, y = interpolate(player, alpha)
+                batch.append((player.image, (x - ox, y - oy)))
+
+            # Barras de vida dos inimigos visíveis: recortes de uma única faixa pré-renderizada
+            bar_strip, bar_areas = health_bar_strip(ENEMY_BAR_WIDTH, ENEMY_BAR_HEIGHT)
+            enemy_batch = []
+            bars = []
+            for enemy in self.enemies:
+                if camera.visible(enemy.rect, view):
+                    x, y = interpolate(enemy, alpha)
+                    x -= ox
+                    y -= oy
+                    enemy_batch.append((enemy.image, (x, y)))
+                    fill = health_bar_fill(enemy.health / enemy.max_health * 100, ENEMY_BAR_WIDTH)
+                    bars.append((bar_strip, (x + 30, y - 1), bar_areas[fill]))
+            enemy_batch.sort(key=_texture_id)
+            batch += enemy_batch
+
+            effect_batch = []
+            for effect in self.effects:
+                if camera.visible(effect.rect, view):
+                    x, y = interpolate(effect, alpha)
+                    effect_batch.append((effect.image, (x - ox, y - oy)))
+            effect_batch.sort(key=_texture_id)
+            batch += effect_batch
+            renderer.blits(batch)
+
+            # SISTEMA DE DEBUG VISUAL
+            if self.show_debug:
+                self.draw_debug()
+
+            renderer.blits(bars)
+
+        with profiler.section('hud'):
+            # HUD por cima dos sprites
+            renderer.draw_hud()
+
+            # Tela de Game Over
+            if self.game_over:
+                screen.blit(self.game_over_overlay, (0, 0))
+
+                draw_text(screen, "GAME OVER", 64, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4, static=True)
+                draw_text(screen, f"Score Final: {self.score}", 36, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+                draw_text(screen, f"Level Alcançado: {self.level}", 36, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 40)
+                draw_text(screen, "Pressione R para reiniciar ou ESC para sair", 24, SCREEN_WIDTH // 2, SCREEN_HEIGHT * 3 // 4,
+                          static=True)
+
+            # Gráfico de tempo por fase
+            if self.show_profiler:
+                profiler.draw(screen, SCREEN_WIDTH - 380, 80)
+
+        # Atualiza a tela
+        with profiler.section('flip'):
+            renderer.present()
+
+    def draw_debug(self):
+        screen = self.screen
+        player = self.player
+        ox, oy = -self.view.left, -self.view.top
+
+        # Desenha hitbox de colisão do player (vermelho)
+        pygame.draw.rect(screen, (255, 0, 0), player.collision_rect.move(ox, oy), 1)
+
+        # Desenha hitbox principal do player (verde)
+        pygame.draw.rect(screen, (0, 255, 0), player.rect.move(ox, oy), 1)
+
+        # Desenha hitbox de ataque (amarelo) quando atacando
+        if player.attacking:
+            sword_hitbox = player.get_sword_hitbox()
+            if sword_hitbox:
+                pygame.draw.rect(screen, (255, 255, 0), sword_hitbox.move(ox, oy), 1)
+
+        # Desenha hitboxes dos inimigos visíveis
+        for enemy in self.enemies:
+            if self.camera.visible(enemy.rect, self.view):
+                pygame.draw.rect(screen, (255, 0, 0), enemy.collision_rect.move(ox, oy), 1)
+                pygame.draw.rect(screen, (0, 255, 0), enemy.rect.move(ox, oy), 1)
+
+        # Texto de debug
+        debug_text = [
+            f"Debug Mode: F1 to toggle",
+            f"Player Pos: ({player.rect.x}, {player.rect.y})",
+            f"Enemies: {len(self.enemies)}",
+            f"Spawns: {log.counters['enemy_spawns']} | Criados: {log.counters['enemies_created']}",
+            f"Player Health: {player.health}",
+            f"Show Debug: {self.show_debug}"
+        ]
+
+        for i, text in enumerate(debug_text):
+            draw_text(screen, text, 20, 100, 100 + i * 25, YELLOW)
+
+    # ------------------------------------------------------------------
+    # Loop principal
+    # ------------------------------------------------------------------
+    def poll_assets(self, budget_ms=ASSET_POLL_BUDGET_MS):
+        """Publica as imagens que terminaram de carregar; encerra o loader no fim"""
+        self.loader.poll(budget_ms)
+        if self.loader.done:
+            logger.info("✓ Imagens carregadas (%d jobs)", self.loader.total)
+            self.loader.shutdown()
+            self.loader = None
+            self.enemy_pool.prefill(ENEMY_POOL_SIZE)
+            if self.frozen:
+                gc.freeze()  # os sprites do pool também vivem o jogo inteiro
+
+    def loading_screen(self):
+        """Mostra o progresso do carregamento até terminar ou até LOADING_SCREEN_MAX_MS"""
+        screen = self.screen
+        start = pygame.time.get_ticks()
+        while self.loader is not None and self.running:
+            if pygame.time.get_ticks() - start > LOADING_SCREEN_MAX_MS:
+                break
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    self.running = False
+
+            progress = self.loader.progress
+            self.poll_assets(1000 / FPS * 0.75)
+
+            screen.fill(BLACK)
+            draw_text(screen, "Carregando...", 36, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50, static=True)
+            screen.blit(health_bar_surface(progress * 100, 400, 20), (SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT // 2))
+            pygame.display.flip()
+            self.clock.tick(FPS)
+
+        # O primeiro frame do jogo redesenha a tela inteira
+        self.renderer.invalidate()
+
+    def close(self):
+        """Encerra os serviços em segundo plano (pathfinding, carregamento) e registra os diagnósticos"""
+        if self.flow is not None:
+            self.flow.close()
+        if self.loader is not None:
+            self.loader.shutdown()
+            self.loader = None
+        if self.frozen:
+            gc.unfreeze()
+            self.frozen = False
+        log.log_counters(logger)
+
+    def freeze_heap(self):
+        """Tira da coleta de lixo tudo que existe agora (imagens, pools, jogador): vive o jogo inteiro.
+
+        Afeta o processo todo, por isso é chamado uma vez no início do loop, não ao criar o jogo.
+        """
+        if not self.frozen:
+            gc.collect()
+            gc.freeze()
+            self.frozen = True
+
+    def run(self):
+        """Loop em tempo real: eventos, passos fixos da simulação e desenho interpolado"""
+        if self.loader is not None:
+            self.loading_screen()
+        self.freeze_heap()
+
+        profiler = self.profiler
+        while self.running:
+            # Tempo real desde o último frame
+            elapsed = self.clock.tick(FPS)
+            profiler.begin_frame()
+
+            with profiler.section('events'):
+                self.handle_events()
+                if self.loader is not None:
+                    self.poll_assets()
+            self.advance(elapsed)
+            self.prepare_spawns()
+            if self.input.finished:  # fim do replay
+                self.running = False
+
+            # Fração do próximo passo já decorrida, usada para interpolar as posições
+            self.render(self.accumulator / TICK_MS)
+            profiler.end_frame()
@@ -0,0 +1,64 @@
+import pygame
+
+
+class KeyState:
+    """Substitui pygame.key.get_pressed() a partir de um conjunto de teclas pressionadas"""
+
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class KeyboardInput:
+    """Entrada ao vivo: teclado do jogador"""
+
+    finished = False  # fontes gravadas (replay) terminam; o teclado não
+    checkpoint_loads = True  # F9 pode trocar o estado da partida (gravação e replay não deixam)
+
+    def __init__(self):
+        self.attack_requested = False
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+            self.attack_requested = True
+
+    def read(self, tick):
+        """Retorna (teclas, ataque) para o passo da simulação"""
+        attack = self.attack_requested
+        self.attack_requested = False
+        return pygame.key.get_pressed(), attack
+
+
+class ScriptedInput:
+    """Entrada roteirizada para rodar sem teclado (testes, benchmarks).
+
+    script(tick) deve retornar (teclas pressionadas, ataque).
+    """
+
+    finished = False
+    checkpoint_loads = True
+
+    def __init__(self, script):
+        self.script = script
+
+    def handle_event(self, event):
+        pass
+
+    def read(self, tick):
+        pressed, attack = self.script(tick)
+        return KeyState(pressed), attack
+
+
+def circle_script(period=240, attack_every=0):
+    """Roteiro simples: anda em círculos e, opcionalmente, ataca a cada N passos"""
+    moves = [(pygame.K_d,), (pygame.K_d, pygame.K_s), (pygame.K_s,), (pygame.K_a, pygame.K_s),
+             (pygame.K_a,), (pygame.K_a, pygame.K_w), (pygame.K_w,), (pygame.K_d, pygame.K_w)]
+
+    def script(tick):
+        pressed = moves[(tick * len(moves) // period) % len(moves)]
+        attack = bool(attack_every) and tick % attack_every == 0
+        return pressed, attack
+
+    return script
@@ -0,0 +1,125 @@
+"""Carregamento de imagens em segundo plano.
+
+Os PNGs são lidos e decodificados num pool de threads; a thread principal só faz
+o convert_alpha (que precisa do display) e publica o resultado em src.assets,
+aos poucos, dentro de um orçamento de tempo por frame. Enquanto uma animação não
+chega, os sprites usam o fallback e trocam pelos frames reais quando ela fica pronta.
+"""
+import io
+import json
+import logging
+import os
+import time
+from concurrent import futures
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from src import assets
+
+logger = logging.getLogger(__name__)
+
+
+def _read_image(path):
+    """Lê e decodifica um PNG (roda numa thread do pool; sem convert)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return pygame.image.load(io.BytesIO(data), os.path.basename(path))
+
+
+def _decode_clip(paths):
+    return [(path, _read_image(path)) for path in paths]
+
+
+def _decode_atlas(index_path):
+    with open(index_path, encoding='utf-8') as f:
+        index = json.load(f)
+    return _read_image(os.path.join(os.path.dirname(index_path), index['image'])), index
+
+
+class AssetLoader:
+    def __init__(self, workers=4):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='assets')
+        self.jobs = []  # (future, tipo, dados)
+        self.total = 0
+        self.completed = 0
+
+    def request(self, character, states, directions, frame_counts, size=assets.FRAME_SIZE):
+        """Agenda as animações de um personagem (o atlas, se existir, num job só)"""
+        keys = []
+        for state in states:
+            for direction in directions:
+                key = assets.clip_key(character, state, direction, frame_counts[state], size)
+                if not assets.is_cached(key):
+                    assets.mark_pending(key)
+                    keys.append(key)
+        if not keys:
+            return
+
+        index_path = os.path.join(assets.atlas_dir(), f'{character}.json')
+        if os.path.exists(index_path):
+            self._submit(_decode_atlas, index_path, 'atlas', (character, keys))
+            return
+
+        for key in keys:
+            character, state, direction, frame_count, size = key
+            paths = [assets.frame_path(character, state, direction, i) for i in range(frame_count)]
+            self._submit(_decode_clip, [path for path in paths if os.path.exists(path)], 'clip', key)
+
+    def _submit(self, function, argument, kind, data):
+        self.jobs.append((self.executor.submit(function, argument), kind, data))
+        self.total += 1
+
+    @property
+    def done(self):
+        return not self.jobs
+
+    @property
+    def progress(self):
+        """Fração dos jobs já publicados (0..1)"""
+        return self.completed / self.total if self.total else 1.0
+
+    def poll(self, budget_ms=4):
+        """Publica os jobs prontos até estourar o orçamento; retorna quantos publicou"""
+        start = time.perf_counter()
+        published = 0
+        for job in list(self.jobs):
+            if (time.perf_counter() - start) * 1000 >= budget_ms:
+                break
+            future, kind, data = job
+            if not future.done():
+                continue
+            self.jobs.remove(job)
+            self.completed += 1
+            published += 1
+            try:
+                result = future.result()
+            except (OSError, ValueError, KeyError, pygame.error) as e:
+                logger.error("❌ Erro ao carregar %s: %s", data[0], e)
+                result = None
+            self._publish(kind, data, result)
+        return published
+
+    def _publish(self, kind, data, result):
+        """Converte na thread principal e entrega para o cache de assets"""
+        if kind == 'atlas':
+            character, keys = data
+            atlas = None
+            if result is not None:
+                sheet, index = result
+                atlas = (sheet.convert_alpha(), index)
+            assets.store_atlas(character, atlas, keys)
+            return
+
+        frames = []
+        for path, image in result or ():
+            frames.append(assets.store_frame(path, data[4], image.convert_alpha()))
+        assets.store_clip(data, frames)
+
+    def wait(self):
+        """Carrega tudo de uma vez (bloqueia até o fim)"""
+        futures.wait([future for future, kind, data in self.jobs])
+        self.poll(budget_ms=float('inf'))
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
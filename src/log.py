@@ -0,0 +1,141 @@
+"""Logging do jogo fora do caminho do frame.
+
+Os módulos usam o logging da biblioteca padrão (logging.getLogger(__name__)).
+setup_logging() liga os loggers de "src" a um RingBufferHandler: emit() só guarda
+o registro num buffer circular (deque com tamanho máximo) e acorda a thread
+LogWriter, que escreve em lote (um write + flush para vários registros). Se a
+escrita atrasar, os registros mais antigos são descartados e contados, em vez
+de bloquear o jogo.
+
+Diagnósticos frequentes (criação de sprites, clips carregados) ficam em DEBUG,
+desligado por padrão, e são contados com count(); os totais saem no fim da
+partida (log_counters) e no overlay de debug (F1).
+"""
+import atexit
+import logging
+import sys
+import threading
+from collections import Counter, deque
+
+from src.config import LOG_LEVEL, LOG_FILE, LOG_BUFFER_SIZE
+
+LOG_FORMAT = '%(message)s'
+FILE_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+
+# Contadores de eventos de diagnóstico (nome -> quantidade)
+counters = Counter()
+
+_writer = None
+_exception_formatter = logging.Formatter()
+
+
+def count(name, amount=1):
+    """Conta um evento de diagnóstico (sempre ligado; só soma num Counter)"""
+    counters[name] += amount
+
+
+class RingBufferHandler(logging.Handler):
+    """Guarda os registros num buffer circular para a LogWriter escrever depois"""
+
+    def __init__(self, capacity=LOG_BUFFER_SIZE):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+        self.dropped = 0
+        self.wake = threading.Event()
+
+    def emit(self, record):
+        # Resolve a mensagem agora: os argumentos podem mudar até a escrita
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        records = self.records
+        if len(records) == records.maxlen:
+            self.dropped += 1
+        records.append(record)
+        self.wake.set()
+
+    def drain(self):
+        """Retira todos os registros pendentes"""
+        records = self.records
+        drained = []
+        while records:
+            drained.append(records.popleft())
+        return drained
+
+
+class LogWriter(threading.Thread):
+    """Thread que escreve em lote os registros do RingBufferHandler"""
+
+    def __init__(self, buffer, outputs):
+        super().__init__(name='log-writer', daemon=True)
+        self.buffer = buffer
+        self.outputs = outputs  # [(stream, formatter)]
+        self.stopping = False
+
+    def run(self):
+        wake = self.buffer.wake
+        while not self.stopping:
+            wake.wait()
+            wake.clear()
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        records = self.buffer.drain()
+        dropped, self.buffer.dropped = self.buffer.dropped, 0
+        if not records and not dropped:
+            return
+        for stream, formatter in self.outputs:
+            lines = [formatter.format(record) for record in records]
+            if dropped:
+                lines.append(f"… {dropped} mensagens de log descartadas (escrita atrasada)")
+            try:
+                stream.write('\n'.join(lines) + '\n')
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+
+    def stop(self):
+        self.stopping = True
+        self.buffer.wake.set()
+        self.join(timeout=1)
+
+
+def setup_logging(level=LOG_LEVEL, path=LOG_FILE, stream=None):
+    """Liga o logging do jogo (saída padrão e, opcionalmente, um arquivo) com escrita em segundo plano"""
+    global _writer
+    if _writer is not None:
+        return
+    outputs = [(stream or sys.stdout, logging.Formatter(LOG_FORMAT))]
+    if path:
+        outputs.append((open(path, 'a', encoding='utf-8'), logging.Formatter(FILE_FORMAT)))
+
+    buffer = RingBufferHandler()
+    logger = logging.getLogger('src')
+    logger.setLevel(level)
+    logger.addHandler(buffer)
+    logger.propagate = False
+
+    _writer = LogWriter(buffer, outputs)
+    _writer.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Escreve o que falta e encerra a thread de escrita"""
+    global _writer
+    if _writer is None:
+        return
+    _writer.stop()
+    logging.getLogger('src').removeHandler(_writer.buffer)
+    for stream, _ in _writer.outputs[1:]:
+        stream.close()
+    _writer = None
+
+
+def log_counters(logger):
+    """Escreve os totais dos contadores de diagnóstico"""
+    if counters:
+        logger.info("Diagnósticos: %s", ', '.join(f"{name}={value}" for name, value in sorted(counters.items())))
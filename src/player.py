@@ -1,6 +1,10 @@
+import logging
 import pygame
-import os
-from src.animation import Animation
+from src import assets, collision, log
+from src.animation import Clip
+from src.components import Animator, Body
+from src.config import SWORD_ARC, TICK_SCALE, scaled_ticks
+from src.text import render_text
 
 # Cores para fallback
 BLACK = (0, 0, 0)
@@ -12,94 +16,82 @@ YELLOW = (255, 255, 0)
 ORANGE = (255, 165, 0)
 PURPLE = (128, 0, 128)
 
+logger = logging.getLogger(__name__)
+
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    CHARACTER = 'player'
+    STATES = ['idle', 'walk', 'attack']
+    DIRECTIONS = ['down', 'up', 'left', 'right']
+    FRAME_COUNTS = {'idle': 4, 'walk': 6, 'attack': 4}  # 4 frames para idle/attack, 6 para walk
+    FRAME_DURATIONS = {'idle': 150, 'walk': 100, 'attack': 50}
+    FACING_ANGLES = {'right': 0, 'down': 90, 'left': 180, 'up': 270}  # graus, y para baixo
+
+    def __init__(self, x, y, world=None, solid=None):
         super().__init__()
-        print("Inicializando Player com animações multidirecionais...")
 
         # Carrega as animações
-        self.animations = self.load_animations()
-        self.current_state = 'idle'
-        self.direction = 'down'
+        self.animator = Animator(type(self))
         self.facing = 'down'
 
-        self.image = self.animations['idle']['down'].get_current_frame()
+        self.image = self.animator.frame()
 
         # HITBOXES - Ajustadas para melhor centralização
         # A hitbox principal deve ser baseada no tamanho da imagem
         image_width, image_height = self.image.get_size()
 
-        # Hitbox principal (um pouco menor que a imagem)
-        self.rect = pygame.Rect(0, 0, image_width * 0.6, image_height * 0.6)  # 60% do tamanho da imagem
-        self.rect.center = (x, y)
-
-        # Hitbox de colisão (ainda menor para precisão)
-        self.collision_rect = pygame.Rect(0, 0, image_width * 0.4, image_height * 0.4)  # 40% do tamanho da imagem
-        self.collision_rect.center = self.rect.center
+        # Hitbox principal (60% do tamanho da imagem) e de colisão (40%, ainda menor para precisão)
+        self.body = Body((image_width * 0.6, image_height * 0.6), (image_width * 0.4, image_height * 0.4), (x, y))
+        self.rect = self.body.rect
+        self.collision_rect = self.body.collision_rect
 
-        self.speed = 5
+        self.speed = 5 * TICK_SCALE
         self.health = 100
         self.max_health = 100
         self.score = 0
         self.attacking = False
         self.attack_cooldown = 0
-        self.attack_duration = 15
+        self.attack_id = 0  # número do golpe atual (cada inimigo leva dano uma vez por golpe)
+        self.attack_elapsed = 0  # passos desde o início do golpe
+        self.attack_angle = 90  # direção do golpe, fixada ao atacar
+        self.attack_duration = scaled_ticks(15)  # passos que a espada leva para varrer o arco
         self.attack_range = 50
         self.attack_damage = 25
         self.is_moving = False
 
-        print(f"Player criado em posição: ({x}, {y})")
-        print(f"Tamanho da imagem: {image_width}x{image_height}")
-        print(f"Tamanho da hitbox: {self.rect.width}x{self.rect.height}")
-
-    def load_animations(self):
-        """Carrega animações para todas as direções"""
-        animations = {
-            'idle': {},
-            'walk': {},
-            'attack': {}
-        }
-
-        directions = ['down', 'up', 'left', 'right']
-
-        for state in ['idle', 'walk', 'attack']:
-            for direction in directions:
-                try:
-                    frames = self.load_frames(state, direction)
-                    if frames:
-                        if state == 'idle':
-                            animations[state][direction] = Animation(frames, 150)
-                        elif state == 'walk':
-                            animations[state][direction] = Animation(frames, 100)
-                        elif state == 'attack':
-                            animations[state][direction] = Animation(frames, 50)
-                        print(f"✓ {state}_{direction}: {len(frames)} frames")
-                    else:
-                        print(f"✗ Criando fallback para {state}_{direction}")
-                        animations[state][direction] = self.create_fallback_animation(state, direction)
-                except Exception as e:
-                    print(f"❌ Erro em {state}_{direction}: {e}")
-                    animations[state][direction] = self.create_fallback_animation(state, direction)
-
-        return animations
-
-    def load_frames(self, state, direction):
-        """Carrega frames para um estado e direção específicos"""
-        frames = []
-        frame_count = 4 if state in ['idle', 'attack'] else 6  # 4 frames para idle/attack, 6 para walk
-
-        for i in range(frame_count):
-            frame_path = f'assets/images/player/{state}/{direction}/frame_{i}.png'
-            if os.path.exists(frame_path):
-                frame = pygame.image.load(frame_path).convert_alpha()
-                frame = pygame.transform.scale(frame, (128, 128))
-                frames.append(frame)
-
-        return frames if frames else None
-
-    def create_fallback_animation(self, state, direction):
-        """Cria animação de fallback para uma direção específica"""
+        # Limites do mundo (padrão: a tela) e grade de tiles sólidos do mapa (opcional)
+        self.world = world or pygame.Rect(0, 0, 1600, 1200)
+        self.solid = solid
+
+        log.count('players_created')
+        logger.debug("Player criado em (%s, %s): imagem %dx%d, hitbox %dx%d", x, y, image_width, image_height,
+                     self.rect.width, self.rect.height)
+
+    @property
+    def current_state(self):
+        return self.animator.state
+
+    @property
+    def direction(self):
+        return self.animator.direction
+
+    @classmethod
+    def preload(cls, loader=None):
+        """Carrega todos os frames no cache compartilhado (ou agenda no loader em segundo plano)"""
+        if loader is not None:
+            loader.request(cls.CHARACTER, cls.STATES, cls.DIRECTIONS, cls.FRAME_COUNTS)
+        else:
+            assets.preload(cls.CHARACTER, cls.STATES, cls.DIRECTIONS, cls.FRAME_COUNTS)
+
+    @classmethod
+    def create_fallback_clip(cls, state, direction):
+        """Clip de fallback para uma direção específica (frames desenhados uma vez por classe)"""
+        frames = assets.fallback_frames(cls.CHARACTER, state, direction, cls.draw_fallback_frames)
+        return Clip(frames, cls.FRAME_DURATIONS[state])
+
+    @staticmethod
+    def draw_fallback_frames(state, direction):
+        """Desenha os frames de fallback (círculos e polígonos) de um estado/direção"""
         frames = []
         frame_count = 4 if state in ['idle', 'attack'] else 6
 
@@ -151,103 +143,104 @@ class Player(pygame.sprite.Sprite):
 
             frames.append(surf)
 
-        duration = 150 if state == 'idle' else 100 if state == 'walk' else 50
-        return Animation(frames, duration)
+        return frames
 
     def update(self, keys):
         dx, dy = 0, 0
         self.is_moving = False
-        old_direction = self.direction
+        direction = self.direction
 
         # Movimento e detecção de direção
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
             dx = -self.speed
-            self.direction = 'left'
+            direction = 'left'
             self.facing = 'left'
             self.is_moving = True
         elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
             dx = self.speed
-            self.direction = 'right'
+            direction = 'right'
             self.facing = 'right'
             self.is_moving = True
 
         if keys[pygame.K_UP] or keys[pygame.K_w]:
             dy = -self.speed
-            self.direction = 'up'
+            direction = 'up'
             self.facing = 'up'
             self.is_moving = True
         elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
             dy = self.speed
-            self.direction = 'down'
+            direction = 'down'
             self.facing = 'down'
             self.is_moving = True
 
         # Se não está se movendo, mantém a última direção virada
         if not self.is_moving:
-            self.direction = self.facing
-
-        # Move o retângulo principal
-        self.rect.x += dx
-        self.rect.y += dy
-
-        # Atualiza a hitbox de colisão para seguir o retângulo principal
-        self.collision_rect.center = self.rect.center
-
-        # Atualiza estado da animação
+            direction = self.facing
+
+        # Move a hitbox (um eixo por vez, para deslizar nas paredes)
+        body = self.body
+        body.move(dx, 0)
+        if dx and self.solid is not None and self.solid.collides(self.collision_rect):
+            body.move(-dx, 0)
+        body.move(0, dy)
+        if dy and self.solid is not None and self.solid.collides(self.collision_rect):
+            body.move(0, -dy)
+
+        # Atualiza estado da animação (recomeça se mudou de estado ou direção)
         new_state = 'attack' if self.attacking else 'walk' if self.is_moving else 'idle'
-
-        # Reseta animação se mudou de estado ou direção
-        if new_state != self.current_state or old_direction != self.direction:
-            self.current_state = new_state
-            self.animations[self.current_state][self.direction].reset()
+        self.animator.play(new_state, direction)
 
         # Atualiza animação
-        self.animations[self.current_state][self.direction].update()
-        self.image = self.animations[self.current_state][self.direction].get_current_frame()
+        self.animator.update()
+        self.image = self.animator.frame()
 
         # Cooldown do ataque
+        if self.attacking:
+            self.attack_elapsed += 1
         if self.attack_cooldown > 0:
             self.attack_cooldown -= 1
             if self.attack_cooldown == 0:
                 self.attacking = False
 
-        # Mantém o jogador dentro da tela
+        # Mantém o jogador dentro do mundo
         self.keep_in_bounds()
 
     def keep_in_bounds(self):
-        """Mantém o jogador dentro dos limites da tela"""
-        # Limites para a hitbox principal
-        self.rect.left = max(0, self.rect.left)
-        self.rect.right = min(1600, self.rect.right)
-        self.rect.top = max(0, self.rect.top)
-        self.rect.bottom = min(1200, self.rect.bottom)
-
-        # Atualiza a hitbox de colisão para seguir a principal
-        self.collision_rect.center = self.rect.center
+        """Mantém o jogador dentro dos limites do mundo"""
+        world = self.world
+        self.body.clamp(world.left, world.top, world.right, world.bottom)
 
     def attack(self):
         if self.attack_cooldown == 0:
             self.attacking = True
-            self.attack_cooldown = 30
-            self.animations['attack'][self.facing].reset()
+            self.attack_cooldown = scaled_ticks(30)
+            self.attack_id += 1
+            self.attack_elapsed = 0
+            self.attack_angle = self.FACING_ANGLES[self.facing]
+            self.animator.restart('attack', self.facing)
             return True
         return False
 
-    def get_sword_hitbox(self):
-        if not self.attacking:
+    def get_sword_sweep(self):
+        """Trecho do arco varrido pela espada neste passo: (centro, alcance, ângulo inicial, ângulo final).
+
+        O golpe vai de -SWORD_ARC/2 a +SWORD_ARC/2 em torno da direção virada ao atacar, ao longo de
+        attack_duration passos; cada passo cobre só a parte do arco percorrida desde o anterior.
+        """
+        elapsed = self.attack_elapsed
+        if not self.attacking or not 0 < elapsed <= self.attack_duration:
             return None
+        start = self.attack_angle - SWORD_ARC / 2
+        step = SWORD_ARC / self.attack_duration
+        reach = self.collision_rect.width / 2 + self.attack_range
+        return self.collision_rect.center, reach, start + step * (elapsed - 1), start + step * elapsed
 
-        # Hitbox baseada na direção do ataque
-        if self.facing == 'down':
-            return pygame.Rect(self.collision_rect.centerx - 15, self.collision_rect.bottom, 30, self.attack_range)
-        elif self.facing == 'up':
-            return pygame.Rect(self.collision_rect.centerx - 15, self.collision_rect.top - self.attack_range, 30,
-                               self.attack_range)
-        elif self.facing == 'left':
-            return pygame.Rect(self.collision_rect.left - self.attack_range, self.collision_rect.centery - 15,
-                               self.attack_range, 30)
-        elif self.facing == 'right':
-            return pygame.Rect(self.collision_rect.right, self.collision_rect.centery - 15, self.attack_range, 30)
+    def get_sword_hitbox(self):
+        """Retângulo que contém o trecho do arco deste passo (None fora do golpe)"""
+        sweep = self.get_sword_sweep()
+        if sweep is None:
+            return None
+        return collision.arc_bounds(*sweep)
 
     def draw_debug(self, surface):
         """Desenha informações de debug para o player"""
@@ -261,7 +254,6 @@ class Player(pygame.sprite.Sprite):
         pygame.draw.circle(surface, (0, 0, 255), self.rect.center, 3)
 
         # Texto com posição
-        font = pygame.font.SysFont(None, 20)
         pos_text = f"Pos: ({self.rect.centerx}, {self.rect.centery})"
-        text_surface = font.render(pos_text, True, WHITE)
+        text_surface = render_text(pos_text, 20, WHITE)
         surface.blit(text_surface, (self.rect.x, self.rect.y - 20))
\ No newline at end of file
@@ -0,0 +1,47 @@
+import time
+
+
+class SpritePool:
+    """Sprites pré-alocados e reaproveitados, para não alocar (nem coletar) durante as ondas.
+
+    factory() cria um sprite novo; o sprite precisa ter reset(*args), que o reativa.
+    Os sprites adquiridos entram nos grupos do pool; os liberados saem deles e
+    voltam para a lista de livres.
+    """
+
+    def __init__(self, factory, groups=(), size=0):
+        self.factory = factory
+        self.groups = tuple(groups)
+        self.free = []
+        self.prefill(size)
+
+    def __len__(self):
+        return len(self.free)
+
+    def prefill(self, count, budget_ms=None):
+        """Cria sprites até haver count livres.
+
+        Com budget_ms, para quando o tempo acabar (criando ao menos um por chamada) e
+        retorna False se ainda faltam sprites.
+        """
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+        while len(self.free) < count:
+            self.free.append(self.factory())
+            if deadline is not None and time.perf_counter() >= deadline:
+                return len(self.free) >= count
+        return True
+
+    def acquire(self, *args):
+        sprite = self.free.pop() if self.free else self.factory()
+        sprite.reset(*args)
+        sprite.add(*self.groups)
+        return sprite
+
+    def release(self, sprite):
+        """Tira o sprite de todos os grupos e devolve ao pool"""
+        sprite.kill()
+        self.free.append(sprite)
+
+    def release_all(self, sprites):
+        for sprite in list(sprites):
+            self.release(sprite)
@@ -0,0 +1,197 @@
+"""Medição do tempo de cada fase do loop (eventos, player, inimigos, colisões, desenho...).
+
+Os tempos ficam numa janela móvel com min/média/p99 por fase, podem ser mostrados
+num gráfico na tela e exportados para CSV ou para o formato de trace do Chrome
+(chrome://tracing ou https://ui.perfetto.dev). Uma fase também pode ser rodada
+sob o cProfile por alguns frames.
+"""
+import cProfile
+import csv
+import io
+import json
+import logging
+import os
+import pstats
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pygame
+
+from src.config import TICK_MS
+from src.text import render_text
+
+logger = logging.getLogger(__name__)
+
+# Ordem e cor de cada fase no gráfico
+PHASES = {
+    'events': (120, 120, 255),
+    'player': (0, 200, 255),
+    'enemies': (255, 80, 80),
+    'collisions': (255, 200, 0),
+    'draw': (0, 220, 120),
+    'hud': (200, 120, 255),
+    'flip': (180, 180, 180),
+}
+
+
+class FrameProfiler:
+    def __init__(self, window=240, output_dir='.'):
+        self.window = window
+        self.output_dir = output_dir
+        self.history = {name: deque(maxlen=window) for name in PHASES}
+        self.frame_totals = deque(maxlen=window)
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = None
+
+        # Trace no formato do Chrome (só enquanto tracing=True)
+        self.tracing = False
+        self.trace_events = []
+        self.trace_origin = time.perf_counter()
+
+        # cProfile de uma fase por alguns frames
+        self.cprofile = None
+        self.cprofile_phase = None
+        self.cprofile_frames = 0
+
+    # ------------------------------------------------------------------
+    # Medição
+    # ------------------------------------------------------------------
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        self.frame_totals.append((time.perf_counter() - self.frame_start) * 1000)
+        for name, elapsed in self.current.items():
+            self.history[name].append(elapsed)
+            self.current[name] = 0.0
+
+        if self.cprofile is not None:
+            self.cprofile_frames -= 1
+            if self.cprofile_frames <= 0:
+                self._finish_cprofile()
+
+    @contextmanager
+    def section(self, name):
+        """Mede o bloco e soma ao tempo da fase neste frame"""
+        profiling = self.cprofile is not None and self.cprofile_phase == name
+        if profiling:
+            self.cprofile.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            if profiling:
+                self.cprofile.disable()
+            self.current[name] += (end - start) * 1000
+            if self.tracing:
+                self.trace_events.append({
+                    'name': name, 'ph': 'X', 'pid': 0, 'tid': 0,
+                    'ts': (start - self.trace_origin) * 1e6,
+                    'dur': (end - start) * 1e6
+                })
+
+    # ------------------------------------------------------------------
+    # Estatísticas
+    # ------------------------------------------------------------------
+    def stats(self, name):
+        """(min, média, p99) em ms da fase na janela atual"""
+        values = self.history[name] if name != 'frame' else self.frame_totals
+        if not values:
+            return 0.0, 0.0, 0.0
+        ordered = sorted(values)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return ordered[0], sum(ordered) / len(ordered), p99
+
+    def worst_phase(self):
+        """Fase com o maior p99 (a que mais estoura o orçamento do frame)"""
+        return max(PHASES, key=lambda name: self.stats(name)[2])
+
+    # ------------------------------------------------------------------
+    # Exportação
+    # ------------------------------------------------------------------
+    def _output_path(self, extension):
+        stamp = time.strftime('%Y%m%d_%H%M%S')
+        return os.path.join(self.output_dir, f'profile_{stamp}.{extension}')
+
+    def dump_csv(self, path=None):
+        """Salva os tempos de cada frame da janela atual (uma linha por frame)"""
+        path = path or self._output_path('csv')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame'] + list(PHASES) + ['total'])
+            columns = [list(self.history[name]) for name in PHASES]
+            for i, total in enumerate(self.frame_totals):
+                writer.writerow([i] + [f'{column[i]:.4f}' for column in columns] + [f'{total:.4f}'])
+        logger.info("Perfil salvo em %s", path)
+        return path
+
+    def start_trace(self):
+        self.trace_events = []
+        self.tracing = True
+
+    def stop_trace(self, path=None):
+        """Encerra o trace e salva no formato do Chrome"""
+        self.tracing = False
+        path = path or self._output_path('json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.trace_events, 'displayTimeUnit': 'ms'}, f)
+        logger.info("Trace salvo em %s (%d eventos)", path, len(self.trace_events))
+        self.trace_events = []
+        return path
+
+    def profile_phase(self, name, frames=120):
+        """Roda a fase sob o cProfile pelos próximos frames e salva o resultado"""
+        if self.cprofile is not None:
+            return
+        self.cprofile = cProfile.Profile()
+        self.cprofile_phase = name
+        self.cprofile_frames = frames
+        logger.info("cProfile em '%s' por %d frames...", name, frames)
+
+    def _finish_cprofile(self):
+        path = self._output_path(f'{self.cprofile_phase}.prof')
+        self.cprofile.dump_stats(path)
+        report = io.StringIO()
+        pstats.Stats(self.cprofile, stream=report).sort_stats('cumulative').print_stats(10)
+        logger.info("cProfile de '%s' salvo em %s\n%s", self.cprofile_phase, path, report.getvalue())
+        self.cprofile = None
+        self.cprofile_phase = None
+
+    # ------------------------------------------------------------------
+    # Overlay
+    # ------------------------------------------------------------------
+    def draw(self, surface, x, y, width=360, height=120):
+        """Gráfico empilhado dos últimos frames e tabela min/média/p99 por fase"""
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+
+        # Escala: o orçamento de um passo (TICK_MS) fica na metade da altura
+        scale = (height / 2) / TICK_MS
+        columns = list(zip(*(self.history[name] for name in PHASES)))[-width:]
+        colors = list(PHASES.values())
+        for i, frame in enumerate(columns):
+            bottom = height
+            for color, elapsed in zip(colors, frame):
+                bar = max(0, int(elapsed * scale))
+                if bar:
+                    pygame.draw.line(panel, color, (i, bottom - 1), (i, max(0, bottom - bar)))
+                bottom -= bar
+                if bottom <= 0:
+                    break
+        pygame.draw.line(panel, (255, 255, 255), (0, height // 2), (width, height // 2))
+        surface.blit(panel, (x, y))
+
+        # Tabela
+        line_y = y + height + 4
+        header = render_text(f"{'fase':<11}{'min':>7}{'média':>8}{'p99':>8}  ms", 18, (255, 255, 255), static=True)
+        surface.blit(header, (x, line_y))
+        for name in list(PHASES) + ['frame']:
+            line_y += 16
+            low, avg, p99 = self.stats(name)
+            color = PHASES.get(name, (255, 255, 255))
+            text = render_text(f"{name:<11}{low:>7.2f}{avg:>8.2f}{p99:>8.2f}", 18, color)
+            surface.blit(text, (x, line_y))
@@ -0,0 +1,203 @@
+import pygame
+
+from src.config import BLACK, WHITE, GREEN
+from src.text import render_text
+
+
+class Renderer:
+    """Desenho por retângulos sujos sobre um fundo pré-renderizado.
+
+    A cada frame só as áreas onde algo foi desenhado (agora ou no frame anterior)
+    são restauradas a partir do fundo e enviadas com display.update(rects).
+    Elementos do HUD ficam em cache e só são redesenhados quando mudam ou quando
+    algum sprite passa por cima deles. Quadros com overlay de tela inteira
+    (debug, game over) usam um flip completo.
+
+    Ordem por frame: begin(), hud_*() (declara o HUD), blit()/blits()/health_bar(),
+    draw_hud(), present().
+    """
+
+    def __init__(self, screen, background=None):
+        self.screen = screen
+        self.background = None
+        self.set_background(background)
+
+        self.full_redraw = True
+        self.frame_full = True
+        self.drawn = []       # retângulos dinâmicos desenhados no frame atual
+        self.erased = []      # retângulos restaurados do fundo no frame atual
+        self.last_drawn = []  # retângulos dinâmicos desenhados no frame anterior
+        self.hud_dirty = []   # retângulos do HUD redesenhados no frame atual
+        self.hud = {}         # nome -> (chave do estado, Surface, Rect)
+        self.hud_pending = set()  # elementos do HUD que mudaram neste frame
+        self.draw_ops = []    # lotes (rects, [(surface, posição[, área])]) desenhados no frame atual
+
+    def set_background(self, background=None):
+        """Troca a camada de fundo (padrão: tela preta) e força um redesenho completo"""
+        if background is None:
+            background = pygame.Surface(self.screen.get_size())
+            background.fill(BLACK)
+        self.background = background.convert()
+        self.invalidate()
+
+    def update_background(self, draw):
+        """Redesenha o fundo no lugar com draw(surface) (ex.: a câmera andou)"""
+        draw(self.background)
+        self.invalidate()
+
+    def invalidate(self):
+        """O próximo frame redesenha e envia a tela inteira"""
+        self.full_redraw = True
+
+    # ------------------------------------------------------------------
+    # Frame
+    # ------------------------------------------------------------------
+    def begin(self, full=False):
+        """Começa um frame: restaura do fundo o que foi desenhado no anterior"""
+        self.drawn = []
+        self.draw_ops = []
+        self.hud_dirty = []
+        if full or self.full_redraw:
+            self.frame_full = True
+            self.screen.blit(self.background, (0, 0))
+            self.erased = []
+            self.hud.clear()
+            # Depois de um frame com overlay, o seguinte também precisa ser completo
+            self.full_redraw = full
+        else:
+            self.frame_full = False
+            screen, background = self.screen, self.background
+            for rect in self.last_drawn:
+                screen.blit(background, rect, rect)
+            self.erased = list(self.last_drawn)
+
+    def present(self):
+        """Envia o frame para a janela"""
+        if self.frame_full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.erased + self.drawn + self.hud_dirty)
+        self.last_drawn = self.drawn
+
+    # ------------------------------------------------------------------
+    # Camada dinâmica (muda a cada frame)
+    # ------------------------------------------------------------------
+    def blit(self, surface, pos):
+        rect = self.screen.blit(surface, pos)
+        self.drawn.append(rect)
+        self.draw_ops.append(((rect,), ((surface, pos),)))
+        return rect
+
+    def blits(self, ops):
+        """Desenha em lote (uma chamada Surface.blits) uma sequência de (surface, posição[, área])"""
+        rects = self.screen.blits(ops)
+        self.drawn.extend(rects)
+        self.draw_ops.append((rects, ops))
+
+    def health_bar(self, x, y, percentage, width=100, height=20):
+        return self.blit(health_bar_surface(percentage, width, height), (x, y))
+
+    def _replay(self, area):
+        """Redesenha, recortado em area, o conteúdo dinâmico que passa por ela"""
+        screen = self.screen
+        screen.blit(self.background, area, area)
+        screen.set_clip(area)
+        for rects, ops in self.draw_ops:
+            for rect, op in zip(rects, ops):
+                if rect.colliderect(area):
+                    screen.blit(*op)
+        screen.set_clip(None)
+
+    # ------------------------------------------------------------------
+    # HUD (em cache, só redesenha o que mudou)
+    # ------------------------------------------------------------------
+    def _set_hud(self, name, key, make_surface, anchor):
+        """Declara o estado de um elemento do HUD.
+
+        Deve ser chamado antes de desenhar os sprites: se o elemento mudou, a versão
+        antiga é apagada agora, para não apagar sprites desenhados depois.
+        """
+        entry = self.hud.get(name)
+        if entry is not None and entry[0] == key:
+            return
+        if not self.frame_full and entry is not None and entry[2].width:
+            self.screen.blit(self.background, entry[2], entry[2])
+            self.erased.append(entry[2])
+        surface = make_surface()
+        if surface is None:
+            rect = pygame.Rect(0, 0, 0, 0)
+        else:
+            rect = surface.get_rect(**anchor)
+        self.hud[name] = (key, surface, rect)
+        self.hud_pending.add(name)
+
+    def hud_text(self, name, text, size, x, y, color=WHITE, static=False):
+        """Texto do HUD centralizado em x (midtop). text=None esconde o elemento"""
+        key = (text, size, x, y, color)
+        make_surface = lambda: render_text(text, size, color, static=static) if text is not None else None
+        self._set_hud(name, key, make_surface, {'midtop': (x, y)})
+
+    def hud_health_bar(self, name, x, y, percentage, width=100, height=20):
+        key = (health_bar_fill(percentage, width), width, height)
+        make_surface = lambda: health_bar_surface(percentage, width, height)
+        self._set_hud(name, key, make_surface, {'topleft': (x, y)})
+
+    def draw_hud(self):
+        """Desenha (por cima dos sprites) os elementos do HUD que mudaram ou foram cobertos"""
+        screen, erased, drawn = self.screen, self.erased, self.drawn
+        for name, (key, surface, rect) in self.hud.items():
+            if surface is None:
+                continue
+            if self.frame_full:
+                screen.blit(surface, rect)
+            elif (name in self.hud_pending
+                  or rect.collidelist(erased) != -1 or rect.collidelist(drawn) != -1):
+                # Texto com alpha não pode ser desenhado sobre ele mesmo: refaz a área por baixo
+                self._replay(rect)
+                screen.blit(surface, rect)
+                self.hud_dirty.append(rect)
+        self.hud_pending.clear()
+
+
+# Barras de vida já desenhadas: (largura preenchida, largura, altura) -> Surface
+_health_bars = {}
+# Faixas com todas as barras de uma medida: (largura, altura) -> (Surface, [área por preenchimento])
+_health_bar_strips = {}
+
+
+def health_bar_fill(percentage, width):
+    """Largura preenchida (em pixels) de uma barra de vida"""
+    return int(max(0, min(100, percentage)) / 100 * width)
+
+
+def _draw_health_bar(surface, area, fill):
+    x, y, width, height = area
+    pygame.draw.rect(surface, GREEN, (x, y, fill, height))
+    pygame.draw.rect(surface, WHITE, area, 2)
+
+
+def health_bar_surface(percentage, width=100, height=20):
+    """Barra de vida pré-renderizada (uma por largura de preenchimento em pixels)"""
+    fill = health_bar_fill(percentage, width)
+    key = (fill, width, height)
+    surface = _health_bars.get(key)
+    if surface is None:
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        _draw_health_bar(surface, pygame.Rect(0, 0, width, height), fill)
+        _health_bars[key] = surface
+    return surface
+
+
+def health_bar_strip(width, height):
+    """Todas as barras de vida de uma medida numa única Surface, uma por linha.
+
+    Barras de vários inimigos viram (faixa, posição, areas[preenchimento]) numa só chamada blits().
+    """
+    strip = _health_bar_strips.get((width, height))
+    if strip is None:
+        surface = pygame.Surface((width, height * (width + 1)), pygame.SRCALPHA)
+        areas = [pygame.Rect(0, fill * height, width, height) for fill in range(width + 1)]
+        for fill, area in enumerate(areas):
+            _draw_health_bar(surface, area, fill)
+        strip = _health_bar_strips[(width, height)] = (surface, areas)
+    return strip
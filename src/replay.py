@@ -0,0 +1,171 @@
+"""Gravação e reprodução da entrada do jogador (replays).
+
+Um replay guarda a semente da partida e, para cada passo da simulação, as teclas
+de movimento e o ataque num único uint16. Com a mesma semente, o mesmo mapa e o
+mesmo modo de movimento, Game reproduz a partida passo a passo; o checksum do
+estado final (gravado no fim do arquivo) confirma que nada divergiu.
+
+Formato (little-endian):
+    cabeçalho  REPLAY_HEADER: 'NWRP', versão, flags, semente, passos, checksum final
+    mapa       uint16 com o tamanho + caminho em UTF-8
+    passos     array de uint16 (bits de TRACKED_KEYS, ATTACK_BIT e RESTART_BIT), comprimido com zlib
+"""
+import struct
+import sys
+import zlib
+from array import array
+
+import pygame
+
+from src.input import KeyState, KeyboardInput
+
+MAGIC = b'NWRP'
+VERSION = 1
+# Magia, versão, flags, semente, passos, checksum do estado final
+REPLAY_HEADER = struct.Struct('<4sHHQII')
+MAP_LENGTH = struct.Struct('<H')
+
+# Teclas que o Player lê, na ordem dos bits
+TRACKED_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+                pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s)
+ATTACK_BIT = 1 << len(TRACKED_KEYS)
+# R reinicia depois do game over (Game.step): gravado para o replay reiniciar no mesmo passo
+RESTART_KEY = pygame.K_r
+RESTART_BIT = ATTACK_BIT << 1
+
+# Flags do cabeçalho
+FLAG_BATCH_STEERING = 1
+
+
+def encode_input(keys, attack):
+    """(teclas, ataque) -> uint16"""
+    mask = ATTACK_BIT if attack else 0
+    if keys[RESTART_KEY]:
+        mask |= RESTART_BIT
+    for bit, key in enumerate(TRACKED_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+
+def decode_input(mask):
+    """uint16 -> (teclas pressionadas, ataque)"""
+    pressed = [key for bit, key in enumerate(TRACKED_KEYS) if mask & (1 << bit)]
+    if mask & RESTART_BIT:
+        pressed.append(RESTART_KEY)
+    return pressed, bool(mask & ATTACK_BIT)
+
+
+def state_checksum(game):
+    """CRC32 do estado da simulação (passo, pontuação, jogador e inimigos)"""
+    player = game.player
+    state = [game.tick, game.score, game.level, game.game_over, player.health, tuple(player.rect)]
+    for enemy in game.enemies:
+        state.append((enemy.kind.name, enemy.health, tuple(enemy.rect)))
+    return zlib.crc32(repr(state).encode('utf-8'))
+
+
+class Replay:
+    """Semente, configuração e entrada de cada passo de uma partida"""
+
+    def __init__(self, seed, map_path=None, batch_steering=False, inputs=None, checksum=0):
+        self.seed = seed
+        self.map_path = map_path
+        self.batch_steering = batch_steering
+        self.inputs = inputs if inputs is not None else array('H')
+        self.checksum = checksum
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def save(self, path):
+        flags = FLAG_BATCH_STEERING if self.batch_steering else 0
+        map_bytes = (self.map_path or '').encode('utf-8')
+        inputs = array('H', self.inputs)
+        if sys.byteorder == 'big':
+            inputs.byteswap()
+        with open(path, 'wb') as f:
+            f.write(REPLAY_HEADER.pack(MAGIC, VERSION, flags, self.seed, len(inputs), self.checksum))
+            f.write(MAP_LENGTH.pack(len(map_bytes)))
+            f.write(map_bytes)
+            f.write(zlib.compress(inputs.tobytes(), 9))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, flags, seed, count, checksum = REPLAY_HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} não é um replay")
+        if version != VERSION:
+            raise ValueError(f"Versão de replay não suportada: {version}")
+        offset = REPLAY_HEADER.size
+        (map_length,) = MAP_LENGTH.unpack_from(data, offset)
+        offset += MAP_LENGTH.size
+        map_path = data[offset:offset + map_length].decode('utf-8') or None
+        offset += map_length
+
+        inputs = array('H')
+        inputs.frombytes(zlib.decompress(data[offset:]))
+        if sys.byteorder == 'big':
+            inputs.byteswap()
+        if len(inputs) != count:
+            raise ValueError(f"Replay truncado: {len(inputs)} de {count} passos")
+        return cls(seed, map_path, bool(flags & FLAG_BATCH_STEERING), inputs, checksum)
+
+
+class RecordingInput:
+    """Envolve outra fonte de entrada e grava o que ela devolve a cada passo"""
+
+    finished = False
+    # Carregar um checkpoint muda o estado por fora da entrada: o replay divergiria da gravação
+    checkpoint_loads = False
+
+    def __init__(self, source=None):
+        self.source = source or KeyboardInput()
+        self.inputs = array('H')
+
+    def handle_event(self, event):
+        self.source.handle_event(event)
+
+    def read(self, tick):
+        keys, attack = self.source.read(tick)
+        self.inputs.append(encode_input(keys, attack))
+        return keys, attack
+
+    def replay(self, game):
+        """Replay com a configuração da partida e o checksum do estado atual"""
+        return Replay(game.seed, game.map_path, game.batch_steering, self.inputs, state_checksum(game))
+
+
+class ReplayInput:
+    """Devolve a entrada gravada, um passo por leitura; depois do último, nenhuma tecla.
+
+    Conta as próprias leituras em vez de usar tick: reiniciar a partida zera o tick do jogo.
+    """
+
+    checkpoint_loads = False
+
+    def __init__(self, replay):
+        self.inputs = replay.inputs
+        self.position = 0
+        # Teclas já decodificadas: o replay usa poucas combinações diferentes
+        self.decoded = {}
+        self.finished = not self.inputs
+
+    def handle_event(self, event):
+        pass
+
+    def read(self, tick):
+        position = self.position
+        self.position += 1
+        self.finished = self.position >= len(self.inputs)
+        if position >= len(self.inputs):
+            return KeyState(), False
+        mask = self.inputs[position]
+        decoded = self.decoded.get(mask)
+        if decoded is None:
+            pressed, attack = decode_input(mask)
+            decoded = self.decoded[mask] = (KeyState(pressed), attack)
+        return decoded
+
@@ -0,0 +1,188 @@
+"""Snapshot do estado da partida: reinício instantâneo e checkpoints.
+
+capture(game) devolve só dados simples (listas, números, strings): o snapshot em
+memória já é uma cópia, e save()/load() gravam o mesmo conteúdo em JSON
+comprimido com zlib. restore(game, snapshot) reaproveita o jogador, os sprites
+do pool e as imagens já carregadas; nada é recarregado do disco.
+
+O estado inclui o que decide o resto da partida: o random, o plano da onda
+(spawns), os inimigos já atingidos pelo golpe em andamento, as posições em float
+do movimento em lote e a ordem dos inimigos na grade espacial (ordem dos acertos
+da espada, que muda o combo). Assim, continuar de um snapshot dá o
+mesmo resultado que continuar a partida original.
+"""
+import json
+import random
+import zlib
+
+from src.enemy_types import ENEMY_TYPES
+
+SNAPSHOT_VERSION = 5
+
+# Campos do jogo copiados como estão
+GAME_FIELDS = ('tick', 'sim_time', 'score', 'level', 'enemies_per_level', 'enemies_defeated', 'combo_counter',
+               'combo_timer', 'enemies_spawned', 'game_over')
+PLAYER_FIELDS = ('health', 'max_health', 'speed', 'score', 'attacking', 'attack_cooldown', 'attack_id',
+                 'attack_elapsed', 'attack_angle', 'facing', 'is_moving')
+# Cada inimigo é uma lista nesta ordem (compacto no JSON)
+ENEMY_FIELDS = ('kind', 'center', 'health', 'speed', 'hit_flash', 'is_moving', 'facing', 'animation',
+                'update_phase')
+EFFECT_FIELDS = ('effect_type', 'center', 'lifetime', 'current_frame')
+# Tipo de cada seção do snapshot (conferido ao ler do disco); 'steering' só existe no movimento em lote
+SECTIONS = {'world': list, 'game': dict, 'rng': list, 'player': dict, 'enemies': list, 'effects': list,
+            'grid': dict, 'sword_hits': list, 'waves': dict, 'flow': (dict, type(None))}
+
+
+def _animation_state(animator):
+    playback = animator.playback
+    return [animator.state, animator.direction, playback.current_frame, playback.elapsed]
+
+
+def _restore_animation(animator, state):
+    name, direction, current_frame, elapsed = state
+    animator.reset(name, direction)
+    animator.playback.current_frame = current_frame % len(animator.playback.frames)
+    animator.playback.elapsed = elapsed
+
+
+def capture(game):
+    """Estado da partida como dados simples (cópia independente do jogo)"""
+    player = game.player
+    if game.enemy_animation is not None:
+        game.enemy_animation.write_back()  # animação em lote: os sprites ficam em dia
+    enemies = list(game.enemies)
+    index = {enemy: i for i, enemy in enumerate(enemies)}
+
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'map': game.map_path,
+        'world': list(game.world),
+        'game': {name: getattr(game, name) for name in GAME_FIELDS},
+        'rng': game.rng.getstate(),
+        'player': dict({name: getattr(player, name) for name in PLAYER_FIELDS},
+                       center=list(player.rect.center), animation=_animation_state(player.animator)),
+        'enemies': [[enemy.kind.name, list(enemy.rect.center), enemy.health, enemy.speed, enemy.hit_flash,
+                     enemy.is_moving, enemy.facing, _animation_state(enemy.animator), enemy.update_phase]
+                    for enemy in enemies],
+        'effects': [[effect.effect_type, list(effect.rect.center), effect.lifetime, effect.current_frame]
+                    for effect in game.effects],
+        'grid': game.enemy_grid.dump(index),
+        'sword_hits': [game.sword_hits.attack_id, sorted(index[enemy] for enemy in game.sword_hits.hits)],
+        'waves': game.waves.dump(),
+        'flow': game.flow.dump() if game.flow is not None else None,
+    }
+
+    # Movimento em lote: posições em float, ordem dos arrays e fase de atualização distante
+    steering = game.enemy_steering
+    if steering is not None:
+        n = len(steering)
+        snapshot['steering'] = {
+            'order': [index[enemy] for enemy in steering.entities],
+            'pos': steering.pos[:n].tolist(),
+            'phase': steering.phase[:n].tolist(),
+            'added': steering.added,
+        }
+    return snapshot
+
+
+def restore(game, snapshot):
+    """Volta a partida para o snapshot reaproveitando jogador, pools e imagens"""
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"Versão de snapshot não suportada: {snapshot.get('version')}")
+    if list(game.world) != snapshot['world']:
+        raise ValueError("Snapshot de outro mapa")
+
+    # Sprites da partida atual voltam para os pools
+    game.enemy_pool.release_all(game.enemies)
+    game.effect_pool.release_all(game.effects)
+    game.enemy_grid.clear()
+    if game.enemy_steering is not None:
+        game.enemy_steering.clear()
+
+    state = snapshot['game']
+    for name in GAME_FIELDS:
+        setattr(game, name, state[name])
+
+    player = game.player
+    state = snapshot['player']
+    for name in PLAYER_FIELDS:
+        setattr(player, name, state[name])
+    player.body.place(state['center'])
+    _restore_animation(player.animator, state['animation'])
+    player.image = player.animator.frame()
+
+    # Inimigos na ordem original (o reset do pool sorteia posição: usa um random descartável)
+    scratch = random.Random(0)
+    enemies = []
+    for kind, center, health, speed, hit_flash, is_moving, facing, animation, update_phase in snapshot['enemies']:
+        enemy = game.enemy_pool.acquire(player, scratch, game.world, ENEMY_TYPES[kind])
+        enemy.body.place(center)
+        enemy.health = health
+        enemy.speed = speed
+        enemy.hit_flash = hit_flash
+        enemy.is_moving = is_moving
+        enemy.facing = facing
+        enemy.update_phase = update_phase
+        enemy.flow = game.flow
+        _restore_animation(enemy.animator, animation)
+        enemy.image = enemy.animator.frame(enemy.flash_variant if hit_flash else enemy.variant)
+        enemies.append(enemy)
+
+    for effect_type, center, lifetime, current_frame in snapshot['effects']:
+        effect = game.effect_pool.acquire(center[0], center[1], effect_type)
+        effect.lifetime = lifetime
+        effect.current_frame = current_frame
+        effect.image = effect.frames[current_frame]
+
+    game.enemy_grid.load(snapshot['grid'], enemies)
+    attack_id, hits = snapshot['sword_hits']
+    game.sword_hits.attack_id = attack_id
+    game.sword_hits.hits = {enemies[i] for i in hits}
+    game.waves.load(snapshot['waves'])
+
+    steering = game.enemy_steering
+    saved = snapshot.get('steering')
+    if steering is not None:
+        order = saved['order'] if saved is not None else range(len(enemies))
+        for i in order:
+            steering.add(enemies[i])
+        if saved is not None:
+            n = len(order)
+            if n:
+                steering.pos[:n] = saved['pos']
+                steering.phase[:n] = saved['phase']
+            steering.added = saved['added']
+
+    version, state, gauss = snapshot['rng']
+    game.rng.setstate((version, tuple(state), gauss))
+
+    # Câmera, campo de direções e desenho acompanham o estado novo
+    game.previous_positions = {}
+    game.accumulator = 0.0
+    game.camera.follow(player.rect.center)
+    if game.flow is not None and not game.flow.load(snapshot['flow']):
+        game.flow.set_target(*player.rect.center)
+    game.renderer.invalidate()
+
+
+def save(snapshot, path):
+    with open(path, 'wb') as f:
+        f.write(zlib.compress(json.dumps(snapshot, separators=(',', ':')).encode('utf-8')))
+
+
+def load(path):
+    """Snapshot salvo com save(); ValueError se o arquivo estiver corrompido ou incompleto"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        snapshot = json.loads(zlib.decompress(data).decode('utf-8'))
+    except (zlib.error, json.JSONDecodeError, UnicodeDecodeError, TypeError) as e:
+        raise ValueError(f"Snapshot inválido: {e}") from e
+    if not isinstance(snapshot, dict):
+        raise ValueError("Snapshot inválido: conteúdo não é um objeto")
+    for name, kind in SECTIONS.items():
+        if not isinstance(snapshot.get(name), kind):
+            raise ValueError(f"Snapshot inválido: seção '{name}' ausente ou com tipo errado")
+    if not isinstance(snapshot.get('steering', {}), dict):
+        raise ValueError("Snapshot inválido: seção 'steering' com tipo errado")
+    return snapshot
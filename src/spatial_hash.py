@@ -0,0 +1,110 @@
+class SpatialHash:
+    """Grade uniforme para encontrar rapidamente quem pode colidir com um retângulo.
+
+    Cada item é registrado nas células que seu retângulo ocupa. As consultas só
+    examinam as células tocadas, em vez de percorrer todos os inimigos.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}   # (cx, cy) -> {item: None} (dict mantém a ordem de inserção)
+        self.items = {}   # item -> (rect, faixa de células ocupadas)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.items
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _add_to_cells(self, item, cell_range):
+        x0, y0, x1, y1 = cell_range
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = bucket = {}
+                bucket[item] = None
+
+    def _remove_from_cells(self, item, cell_range):
+        x0, y0, x1, y1 = cell_range
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.pop(item, None)
+                    if not bucket:
+                        del cells[(cx, cy)]
+
+    def clear(self):
+        self.cells.clear()
+        self.items.clear()
+
+    def insert(self, item, rect):
+        """Registra um item (ou atualiza, se já estiver na grade)"""
+        self.update(item, rect)
+
+    def update(self, item, rect):
+        """Atualiza a posição de um item; só mexe na grade se ele mudou de célula"""
+        cell_range = self._cell_range(rect)
+        entry = self.items.get(item)
+        if entry is not None:
+            if entry[1] == cell_range:
+                self.items[item] = (rect, cell_range)
+                return
+            self._remove_from_cells(item, entry[1])
+        self._add_to_cells(item, cell_range)
+        self.items[item] = (rect, cell_range)
+
+    def remove(self, item):
+        entry = self.items.pop(item, None)
+        if entry is not None:
+            self._remove_from_cells(item, entry[1])
+
+    def dump(self, index):
+        """Itens e células (com a ordem de cada uma) para snapshots; cada item vira index[item]"""
+        return {
+            'items': [index[item] for item in self.items],
+            'cells': [[cx, cy, [index[item] for item in bucket]] for (cx, cy), bucket in self.cells.items()],
+        }
+
+    def load(self, data, items, key=lambda item: item.collision_rect):
+        """Refaz a grade a partir de dump(); items[i] é o item de índice i"""
+        self.clear()
+        for i in data['items']:
+            rect = key(items[i])
+            self.items[items[i]] = (rect, self._cell_range(rect))
+        for cx, cy, bucket in data['cells']:
+            self.cells[(cx, cy)] = {items[i]: None for i in bucket}
+
+    def rebuild(self, items, key=lambda item: item.collision_rect):
+        """Reconstrói a grade inteira a partir de uma sequência de itens"""
+        self.clear()
+        for item in items:
+            self.update(item, key(item))
+
+    def query(self, rect):
+        """Itens cujo retângulo colide com rect, na ordem em que foram inseridos"""
+        x0, y0, x1, y1 = self._cell_range(rect)
+        cells = self.cells
+        items = self.items
+        seen = set()
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for item in bucket:
+                    if item in seen:
+                        continue
+                    seen.add(item)
+                    if rect.colliderect(items[item][0]):
+                        found.append(item)
+        return found
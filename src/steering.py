@@ -0,0 +1,201 @@
+"""Movimento em lote dos inimigos com NumPy (opcional).
+
+Posições e velocidades ficam em arrays (estrutura de arrays) e todos os inimigos
+andam em direção ao alvo numa única passada vetorizada. Para os sprites só é
+devolvido o centro; direção e se está andando ficam em motion para o
+AnimationSystem (src.systems), que guarda os próprios componentes nestes
+mesmos índices (column/attach).
+"""
+from src.config import TICK_MS
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional; sem ele cada inimigo usa Enemy.update
+    np = None
+
+# Mesma ordem usada nos códigos de direção calculados em step()
+DIRECTIONS = ('down', 'up', 'left', 'right')
+
+
+def available():
+    """True se o numpy estiver instalado"""
+    return np is not None
+
+
+class SteeringSystem:
+    def __init__(self, bounds, capacity=256, moving_distance=20):
+        self.bounds = bounds
+        self.moving_distance = moving_distance
+        self.capacity = capacity
+        self.entities = []
+        self.slots = {}  # inimigo -> índice nos arrays
+        self.columns = []
+        self.systems = []  # sistemas com componentes nestes arrays (src.systems)
+
+        self.pos = self.column('pos', (2,))
+        self.speed = self.column('speed')
+        self.low = self.column('low', (2,))   # limites do centro (já descontado meio tamanho)
+        self.high = self.column('high', (2,))
+        self.phase = self.column('phase', dtype=int)  # em qual passo o inimigo distante é atualizado
+        self.center = self.column('center', (2,), int)  # centro do sprite (pos arredondada)
+        self.previous = self.column('previous', (2,), int)  # centro no início do passo
+        self.added = 0
+        # Resultado do último step: (índices ou None = todos, dt em ms, código de direção, andando)
+        self.motion = None
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __contains__(self, enemy):
+        return enemy in self.slots
+
+    def column(self, name, shape=(), dtype=float):
+        """Cria um array com uma linha por inimigo, que cresce e é compactado junto com os outros"""
+        array = np.zeros((self.capacity,) + shape, dtype=dtype)
+        setattr(self, name, array)
+        self.columns.append(name)
+        return array
+
+    def attach(self, system):
+        """Registra um sistema: system.added(i, enemy) preenche as colunas dele em cada add"""
+        self.systems.append(system)
+
+    def clear(self):
+        """Esvazia mantendo colunas e sistemas (ex.: restaurar um snapshot)"""
+        self.entities = []
+        self.slots = {}
+        self.added = 0
+        self.motion = None
+
+    def _grow(self):
+        self.capacity *= 2
+        for name in self.columns:
+            old = getattr(self, name)
+            new = np.zeros((self.capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add(self, enemy):
+        """Registra um inimigo copiando posição, velocidade e tamanho para os arrays"""
+        if enemy in self.slots:
+            return
+        if len(self.entities) == self.capacity:
+            self._grow()
+
+        i = len(self.entities)
+        self.entities.append(enemy)
+        self.slots[enemy] = i
+
+        left, top, right, bottom = self.bounds
+        half_w, half_h = enemy.rect.width / 2, enemy.rect.height / 2
+        self.pos[i] = enemy.rect.center
+        self.center[i] = enemy.rect.center
+        self.previous[i] = enemy.rect.center
+        self.speed[i] = enemy.speed
+        self.low[i] = (left + half_w, top + half_h)
+        self.high[i] = (right - half_w, bottom - half_h)
+        self.phase[i] = self.added  # espalha os inimigos distantes entre os passos
+        self.added += 1
+        for system in self.systems:
+            system.added(i, enemy)
+
+    def remove(self, enemy):
+        """Remove um inimigo movendo o último para o lugar dele (arrays continuam densos)"""
+        i = self.slots.pop(enemy, None)
+        if i is None:
+            return
+        last = len(self.entities) - 1
+        if i != last:
+            moved = self.entities[last]
+            self.entities[i] = moved
+            self.slots[moved] = i
+            for name in self.columns:
+                array = getattr(self, name)
+                array[i] = array[last]
+        self.entities.pop()
+
+    def max_step(self):
+        """Maior deslocamento (px, em x ou y) de um inimigo no último step"""
+        n = len(self.entities)
+        return int(np.abs(self.center[:n] - self.previous[:n]).max()) if n else 0
+
+    def step(self, target, active=None, tick=0, far_interval=1, flow=None):
+        """Move os inimigos em direção ao alvo e atualiza o centro dos sprites.
+
+        flow (src.flowfield.FlowField): onde houver direção no campo, segue o campo
+        em vez de ir em linha reta (contorna paredes).
+
+        active (left, top, right, bottom): inimigos fora dessa área só andam a cada
+        far_interval passos (com o deslocamento acumulado), e só esses sprites são
+        tocados. Retorna a lista dos inimigos que se moveram; direção e estado
+        de cada um ficam em self.motion.
+        """
+        n = len(self.entities)
+        self.motion = None
+        if not n:
+            return []
+        self.previous[:n] = self.center[:n]
+
+        pos = self.pos[:n]
+
+        # Quem anda neste passo: todos da área ativa e a fração da vez dos distantes
+        steps = np.ones(n)
+        if active is not None and far_interval > 1:
+            left, top, right, bottom = active
+            near = (pos[:, 0] >= left) & (pos[:, 0] < right) & (pos[:, 1] >= top) & (pos[:, 1] < bottom)
+            turn = near | ((self.phase[:n] + tick) % far_interval == 0)
+            steps[~near] = far_interval
+            indices = np.flatnonzero(turn)
+        else:
+            indices = None
+
+        if indices is not None and len(indices) < n:
+            moved_pos = pos[indices]
+            speed = self.speed[indices] * steps[indices]
+            low, high = self.low[indices], self.high[indices]
+            steps = steps[indices]
+        else:
+            indices = None
+            moved_pos = pos
+            speed = self.speed[:n] * steps
+            low, high = self.low[:n], self.high[:n]
+
+        delta = np.asarray(target, dtype=float) - moved_pos
+        dist = np.hypot(delta[:, 0], delta[:, 1])
+
+        # Direção do passo: reta até o alvo, ou a do campo de direções quando houver
+        heading, length = delta, dist
+        if flow is not None:
+            guide = flow.directions(moved_pos)
+            guided = (guide != 0).any(axis=1)
+            if guided.any():
+                heading = np.where(guided[:, None], guide, delta)
+                length = np.where(guided, np.hypot(guide[:, 0], guide[:, 1]), dist)
+        dx, dy = heading[:, 0], heading[:, 1]
+
+        # Mesma regra de Enemy.determine_direction: 0=down, 1=up, 2=left, 3=right
+        horizontal = np.abs(dx) > np.abs(dy)
+        codes = np.where(horizontal, np.where(dx < 0, 2, 3), np.where(dy < 0, 1, 0))
+        moving = dist > self.moving_distance
+
+        # Passo normalizado (inimigos já em cima do alvo não se movem)
+        scale = np.divide(speed, length, out=np.zeros(len(length)), where=length > 0)
+        moved_pos += heading * scale[:, None]
+        np.clip(moved_pos, low, high, out=moved_pos)
+
+        if indices is None:
+            entities = self.entities
+        else:
+            pos[indices] = moved_pos
+            entities = [self.entities[i] for i in indices.tolist()]
+
+        # Devolve para os sprites só o centro; a animação fica com o AnimationSystem
+        centers = np.rint(moved_pos).astype(int)
+        if indices is None:
+            self.center[:n] = centers
+        else:
+            self.center[indices] = centers
+        for enemy, center in zip(entities, centers.tolist()):
+            enemy.body.place(center)
+        self.motion = (indices, steps * TICK_MS, codes, moving)
+        return entities
@@ -0,0 +1,188 @@
+"""Sistemas em lote sobre os arrays dos inimigos (NumPy, opcional).
+
+Os componentes ficam em colunas do SteeringSystem (src.steering), nos mesmos
+índices do movimento, e cada sistema percorre os arrays densos numa passada:
+- AnimationSystem: tempo e frame do clip e o piscar ao levar dano; o sprite só é
+  tocado quando a imagem muda (troca de frame, de clip ou fim do piscar)
+- ContactSystem: dano por contato de todos os inimigos no jogador, com o mesmo
+  teste contínuo de src.collision.swept_aabb
+
+Sem numpy, cada inimigo faz o mesmo em Enemy.set_motion e Game.resolve_collisions.
+"""
+from src import assets
+from src.components import ClipSet
+from src.config import TICK_MS
+from src.steering import DIRECTIONS, np
+
+
+class AnimationSystem:
+    """Animação dos inimigos: clip, frame, tempo no frame e passos de piscar, por índice"""
+
+    def __init__(self, store, owner):
+        self.store = store
+        self.owner = owner
+        self.clipset = ClipSet.of(owner)
+        # Código do clip = estado * len(DIRECTIONS) + direção (mesma ordem de src.steering)
+        self.keys = [(state, direction) for state in owner.STATES for direction in DIRECTIONS]
+        self.codes = {key: code for code, key in enumerate(self.keys)}
+        self.generation = None
+        self._load_clips()
+
+        store.column('anim_clip', dtype=int)
+        store.column('anim_frame', dtype=int)
+        store.column('anim_elapsed')
+        store.column('anim_flash', dtype=int)
+        store.attach(self)
+
+    def _load_clips(self):
+        clipset = self.clipset
+        if clipset.generation != assets.generation:
+            clipset.refresh()
+        self.generation = clipset.generation
+        self.clips = [clipset.clips[key] for key in self.keys]
+        self.durations = np.array([clip.frame_duration for clip in self.clips], dtype=float)
+        self.counts = np.array([len(clip.frames) for clip in self.clips])
+
+    def added(self, i, enemy):
+        """Copia o estado de animação do sprite (spawn ou snapshot restaurado)"""
+        store = self.store
+        animator = enemy.animator
+        store.anim_clip[i] = self.codes[(animator.state, animator.direction)]
+        store.anim_frame[i] = animator.playback.current_frame
+        store.anim_elapsed[i] = animator.playback.elapsed
+        store.anim_flash[i] = enemy.hit_flash
+
+    def flash(self, enemy):
+        """Acompanha o piscar iniciado por Enemy.hit"""
+        i = self.store.slots.get(enemy)
+        if i is not None:
+            self.store.anim_flash[i] = enemy.hit_flash
+
+    def step(self, indices, dts, codes, moving):
+        """Avança a animação dos inimigos que se moveram (argumentos de SteeringSystem.motion)"""
+        store = self.store
+        n = len(store)
+        if not n:
+            return
+        if indices is None:
+            indices = np.arange(n)
+        refresh = self.generation != assets.generation
+        if refresh:
+            # Clips que chegaram do carregamento em segundo plano: mantém a posição (Animation.swap)
+            self._load_clips()
+            store.anim_frame[:n] %= self.counts[store.anim_clip[:n]]
+
+        # Recomeça do primeiro frame quem mudou de estado ou direção (Animator.play)
+        clip = moving.astype(int) * len(DIRECTIONS) + codes
+        changed = clip != store.anim_clip[indices]
+        frame = np.where(changed, 0, store.anim_frame[indices])
+        elapsed = np.where(changed, 0.0, store.anim_elapsed[indices]) + dts
+
+        # Frames vencidos (Animation.update): sobra de tempo em (0, duração]
+        duration = self.durations[clip]
+        advance = np.maximum(np.ceil(elapsed / duration) - 1, 0)
+        elapsed -= advance * duration
+        over = elapsed > duration
+        advance += over
+        elapsed -= over * duration
+        under = (elapsed <= 0) & (advance > 0)
+        advance -= under
+        elapsed += under * duration
+        frame = (frame + advance.astype(int)) % self.counts[clip]
+
+        flash = store.anim_flash[indices]
+        flashing = flash > 0
+        flash = np.where(flashing, np.maximum(flash - np.rint(dts / TICK_MS).astype(int), 0), flash)
+
+        store.anim_clip[indices] = clip
+        store.anim_frame[indices] = frame
+        store.anim_elapsed[indices] = elapsed
+        store.anim_flash[indices] = flash
+
+        if refresh:
+            self.write_back()
+            return
+        dirty = np.flatnonzero(changed | (advance > 0) | (flashing & (flash == 0)))
+        if len(dirty):
+            self._write(indices[dirty].tolist())
+
+    def _write(self, rows):
+        """Copia o estado dos arrays para os sprites das linhas rows e troca a imagem"""
+        store = self.store
+        entities = store.entities
+        for i, clip, frame, elapsed, flash in zip(rows, store.anim_clip[rows].tolist(),
+                                                  store.anim_frame[rows].tolist(),
+                                                  store.anim_elapsed[rows].tolist(),
+                                                  store.anim_flash[rows].tolist()):
+            enemy = entities[i]
+            state, direction = self.keys[clip]
+            enemy.is_moving = state == 'walk'
+            enemy.facing = direction
+            enemy.hit_flash = flash
+            animator = enemy.animator
+            animator.state = state
+            animator.direction = direction
+            animator.generation = self.generation
+            playback = animator.playback
+            playback.clip = self.clips[clip]
+            playback.current_frame = frame
+            playback.elapsed = elapsed
+            enemy.image = playback.get_current_frame(enemy.flash_variant if flash else enemy.variant)
+
+    def write_back(self):
+        """Atualiza todos os sprites com o estado dos arrays (ex.: antes de um snapshot)"""
+        self._write(list(range(len(self.store))))
+
+
+class ContactSystem:
+    """Dano por contato: hitbox de colisão de cada inimigo contra a do jogador, no passo inteiro"""
+
+    def __init__(self, store):
+        self.store = store
+        store.column('contact_size', (2,), int)
+        store.column('contact_damage')
+        store.attach(self)
+
+    def added(self, i, enemy):
+        self.store.contact_size[i] = enemy.collision_rect.size
+        self.store.contact_damage[i] = enemy.kind.contact_damage
+
+    def damage(self, player_before, pdx, pdy):
+        """Soma do contact_damage dos inimigos que encostam no jogador durante o passo.
+
+        player_before é a hitbox de colisão do jogador no início do passo e (pdx, pdy)
+        o deslocamento dele: o teste é o de swept_aabb em movimento relativo.
+        """
+        store = self.store
+        n = len(store)
+        if not n:
+            return 0.0
+        size = store.contact_size[:n]
+        previous = store.previous[:n]
+        # Hitbox no início do passo, como Rect.center faz: canto = centro - tamanho // 2
+        start = previous - size // 2
+        delta = store.center[:n] - previous
+        delta -= (pdx, pdy)
+        end = start + delta
+        target_low = np.array(player_before.topleft)
+        target_high = np.array(player_before.bottomright)
+
+        # Broad phase: só quem tem a área varrida (relativa ao jogador) sobre ele
+        near = (np.minimum(start, end) < target_high) & (np.maximum(start, end) + size > target_low)
+        rows = np.flatnonzero(near.all(axis=1))
+        if not len(rows):
+            return 0.0
+        low = start[rows]
+        high = low + size[rows]
+        delta = delta[rows].astype(float)
+
+        # Entrada e saída por eixo (sem movimento no eixo: precisa já sobrepor nele)
+        still = delta == 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            enter = np.where(delta > 0, target_low - high, target_high - low) / delta
+            leave = np.where(delta > 0, target_high - low, target_low - high) / delta
+        overlap = (high > target_low) & (low < target_high)
+        entry = np.where(still, -np.inf, enter).max(axis=1)
+        exit_ = np.where(still, np.inf, leave).min(axis=1)
+        hit = (overlap | ~still).all(axis=1) & (entry < exit_) & (exit_ > 0) & (entry < 1)
+        return float(store.contact_damage[rows[hit]].sum())
@@ -0,0 +1,59 @@
+from collections import OrderedDict
+import pygame
+
+WHITE = (255, 255, 255)
+
+# Quantidade máxima de textos renderizados mantidos no cache
+TEXT_CACHE_SIZE = 256
+
+# Fontes já criadas: (face, tamanho) -> Font
+_fonts = {}
+
+# Textos renderizados: (texto, tamanho, cor, face) -> Surface (LRU)
+_text_cache = OrderedDict()
+
+# Textos estáticos nunca saem do cache
+_static_cache = {}
+
+
+def get_font(size, face=None):
+    """Retorna a fonte (face, tamanho), criando só na primeira vez"""
+    key = (face, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(face, size)
+        _fonts[key] = font
+    return font
+
+
+def render_text(text, size, color=WHITE, face=None, static=False):
+    """Renderiza o texto reaproveitando superfícies já renderizadas.
+
+    Textos com static=True (instruções, títulos) ficam fora do LRU e nunca são descartados.
+    """
+    key = (text, size, tuple(color), face)
+
+    surface = _static_cache.get(key)
+    if surface is not None:
+        return surface
+
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        return surface
+
+    surface = get_font(size, face).render(text, True, color)
+    if static:
+        _static_cache[key] = surface
+    else:
+        _text_cache[key] = surface
+        if len(_text_cache) > TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    return surface
+
+
+def clear_cache():
+    """Descarta fontes e textos renderizados"""
+    _fonts.clear()
+    _text_cache.clear()
+    _static_cache.clear()
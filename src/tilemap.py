@@ -0,0 +1,382 @@
+"""Mapas do Tiled (.tmx): camadas de tiles, camadas de objetos e grade de colisão.
+
+O arquivo é lido uma única vez. As camadas de tiles visíveis são "assadas" em
+pedaços (chunks) de CHUNK_SIZE pixels, e a cada frame só os pedaços que a câmera
+enxerga são desenhados — o custo por frame não depende do tamanho do mapa.
+
+Colisão: tiles de uma camada chamada "collision" (ou com a propriedade
+collision=true), tiles com a propriedade solid=true e objetos de uma camada de
+objetos "collision" (ou com tipo/classe "solid") viram células sólidas.
+"""
+import base64
+import gzip
+import logging
+import os
+import struct
+import xml.etree.ElementTree as ET
+import zlib
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 512
+
+# Bits de espelhamento/rotação no gid dos tiles
+FLIPPED_HORIZONTALLY = 0x80000000
+FLIPPED_VERTICALLY = 0x40000000
+FLIPPED_DIAGONALLY = 0x20000000
+GID_MASK = 0x1FFFFFFF
+
+
+def _parse_properties(element):
+    """<properties> -> dict, convertendo bool/int/float"""
+    properties = {}
+    if element is None:
+        return properties
+    for prop in element.iter('property'):
+        value = prop.get('value', prop.text or '')
+        kind = prop.get('type', 'string')
+        if kind == 'bool':
+            value = value == 'true'
+        elif kind == 'int':
+            value = int(value)
+        elif kind == 'float':
+            value = float(value)
+        properties[prop.get('name')] = value
+    return properties
+
+
+def _parse_color(value, default=(0, 0, 0)):
+    """'#rrggbb' ou '#aarrggbb' do Tiled -> (r, g, b)"""
+    if not value:
+        return default
+    value = value.lstrip('#')[-6:]
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _decode_layer_data(data, width, height):
+    """Lista de gids de uma <data> (csv, base64 com/sem compressão, ou XML)"""
+    encoding = data.get('encoding')
+    compression = data.get('compression')
+
+    if encoding == 'csv':
+        gids = [int(value) for value in data.text.replace('\n', '').split(',') if value.strip()]
+    elif encoding == 'base64':
+        raw = base64.b64decode(data.text.strip())
+        if compression == 'zlib':
+            raw = zlib.decompress(raw)
+        elif compression == 'gzip':
+            raw = gzip.decompress(raw)
+        elif compression:
+            raise ValueError(f"compressão não suportada: {compression}")
+        gids = list(struct.unpack(f'<{len(raw) // 4}I', raw))
+    else:
+        gids = [int(tile.get('gid', 0)) for tile in data.iter('tile')]
+
+    if len(gids) != width * height:
+        raise ValueError(f"camada com {len(gids)} tiles, esperado {width * height}")
+    return gids
+
+
+class Tileset:
+    def __init__(self, element, base_dir):
+        self.firstgid = int(element.get('firstgid', 1))
+
+        # Tileset externo (.tsx)
+        source = element.get('source')
+        if source:
+            path = os.path.join(base_dir, source)
+            element = ET.parse(path).getroot()
+            base_dir = os.path.dirname(path)
+
+        self.name = element.get('name', '')
+        self.tile_width = int(element.get('tilewidth'))
+        self.tile_height = int(element.get('tileheight'))
+        self.spacing = int(element.get('spacing', 0))
+        self.margin = int(element.get('margin', 0))
+        self.tile_count = int(element.get('tilecount', 0))
+        self.columns = int(element.get('columns', 0))
+
+        # Propriedades por tile (ex.: solid=true)
+        self.tile_properties = {}
+        for tile in element.iter('tile'):
+            properties = _parse_properties(tile.find('properties'))
+            if properties:
+                self.tile_properties[int(tile.get('id'))] = properties
+
+        self.image = None
+        image = element.find('image')
+        if image is not None:
+            path = os.path.join(base_dir, image.get('source'))
+            try:
+                self.image = pygame.image.load(path).convert_alpha()
+            except (pygame.error, FileNotFoundError) as e:
+                logger.error("❌ Erro ao carregar tileset %s: %s", path, e)
+            if self.image is not None and not self.columns:
+                self.columns = (self.image.get_width() - 2 * self.margin + self.spacing) // (
+                    self.tile_width + self.spacing)
+
+    def tile_surface(self, local_id):
+        """Subsurface do tile no atlas do tileset (sem cópia)"""
+        if self.image is None or not self.columns:
+            return None
+        column, row = local_id % self.columns, local_id // self.columns
+        x = self.margin + column * (self.tile_width + self.spacing)
+        y = self.margin + row * (self.tile_height + self.spacing)
+        rect = pygame.Rect(x, y, self.tile_width, self.tile_height)
+        if not self.image.get_rect().contains(rect):
+            return None
+        return self.image.subsurface(rect)
+
+
+class CollisionGrid:
+    """Grade de células sólidas do mapa, consultada em O(células tocadas)"""
+
+    def __init__(self, width, height, tile_width, tile_height):
+        self.width = width
+        self.height = height
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.cells = bytearray(width * height)
+
+    def set_solid(self, tx, ty, solid=True):
+        if 0 <= tx < self.width and 0 <= ty < self.height:
+            self.cells[ty * self.width + tx] = 1 if solid else 0
+
+    def is_solid(self, tx, ty):
+        """Células fora do mapa contam como sólidas"""
+        if 0 <= tx < self.width and 0 <= ty < self.height:
+            return self.cells[ty * self.width + tx] == 1
+        return True
+
+    def cell_at(self, x, y):
+        return int(x // self.tile_width), int(y // self.tile_height)
+
+    def mark_rect(self, rect):
+        """Marca como sólidas todas as células tocadas por um retângulo em pixels"""
+        x0, y0 = self.cell_at(rect.left, rect.top)
+        x1, y1 = self.cell_at(rect.right - 1, rect.bottom - 1)
+        for ty in range(y0, y1 + 1):
+            for tx in range(x0, x1 + 1):
+                self.set_solid(tx, ty)
+
+    def solid_rects(self, rect):
+        """Retângulos das células sólidas que o rect toca"""
+        x0, y0 = self.cell_at(rect.left, rect.top)
+        x1, y1 = self.cell_at(rect.right - 1, rect.bottom - 1)
+        tw, th = self.tile_width, self.tile_height
+        return [pygame.Rect(tx * tw, ty * th, tw, th)
+                for ty in range(y0, y1 + 1) for tx in range(x0, x1 + 1)
+                if self.is_solid(tx, ty)]
+
+    def collides(self, rect):
+        x0, y0 = self.cell_at(rect.left, rect.top)
+        x1, y1 = self.cell_at(rect.right - 1, rect.bottom - 1)
+        for ty in range(y0, y1 + 1):
+            for tx in range(x0, x1 + 1):
+                if self.is_solid(tx, ty):
+                    return True
+        return False
+
+
+class TileMap:
+    def __init__(self, path, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+
+        root = ET.parse(path).getroot()
+        if root.get('infinite') == '1':
+            raise ValueError("mapas infinitos não são suportados")
+
+        self.width = int(root.get('width'))
+        self.height = int(root.get('height'))
+        self.tile_width = int(root.get('tilewidth'))
+        self.tile_height = int(root.get('tileheight'))
+        self.properties = _parse_properties(root.find('properties'))
+        self.background_color = _parse_color(root.get('backgroundcolor'))
+
+        base_dir = os.path.dirname(path)
+        self.tilesets = sorted((Tileset(element, base_dir) for element in root.findall('tileset')),
+                               key=lambda tileset: tileset.firstgid)
+
+        self.layers = []   # (nome, gids, propriedades, visível, opacidade)
+        self.objects = []  # dicts com name, type, rect e properties
+        self.collision = CollisionGrid(self.width, self.height, self.tile_width, self.tile_height)
+
+        for element in root:
+            if element.tag == 'layer':
+                self._load_tile_layer(element)
+            elif element.tag == 'objectgroup':
+                self._load_object_layer(element)
+
+        self._tile_cache = {}
+        self.chunks = {}
+        self._bake_chunks()
+
+    @property
+    def pixel_width(self):
+        return self.width * self.tile_width
+
+    @property
+    def pixel_height(self):
+        return self.height * self.tile_height
+
+    @property
+    def rect(self):
+        return pygame.Rect(0, 0, self.pixel_width, self.pixel_height)
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def _load_tile_layer(self, element):
+        name = element.get('name', '')
+        properties = _parse_properties(element.find('properties'))
+        gids = _decode_layer_data(element.find('data'), self.width, self.height)
+        visible = element.get('visible', '1') != '0'
+        opacity = float(element.get('opacity', 1))
+
+        collision_layer = name.lower() == 'collision' or properties.get('collision') is True
+        for i, gid in enumerate(gids):
+            if not gid:
+                continue
+            tile_properties = self.tile_properties(gid)
+            if collision_layer or tile_properties.get('solid') is True:
+                self.collision.set_solid(i % self.width, i // self.width)
+
+        # A camada de colisão em si não é desenhada
+        if not collision_layer:
+            self.layers.append((name, gids, properties, visible, opacity))
+
+    def _load_object_layer(self, element):
+        collision_layer = element.get('name', '').lower() == 'collision'
+        for obj in element.iter('object'):
+            kind = obj.get('type') or obj.get('class') or ''
+            rect = pygame.Rect(float(obj.get('x', 0)), float(obj.get('y', 0)),
+                               float(obj.get('width', 0)), float(obj.get('height', 0)))
+            self.objects.append({
+                'name': obj.get('name', ''),
+                'type': kind,
+                'rect': rect,
+                'properties': _parse_properties(obj.find('properties'))
+            })
+            if (collision_layer or kind.lower() == 'solid') and rect.width and rect.height:
+                self.collision.mark_rect(rect)
+
+    def tileset_for(self, gid):
+        gid &= GID_MASK
+        found = None
+        for tileset in self.tilesets:
+            if tileset.firstgid <= gid:
+                found = tileset
+            else:
+                break
+        return found
+
+    def tile_properties(self, gid):
+        tileset = self.tileset_for(gid)
+        if tileset is None:
+            return {}
+        return tileset.tile_properties.get((gid & GID_MASK) - tileset.firstgid, {})
+
+    def tile_image(self, gid):
+        """Surface do tile já espelhado/rotacionado conforme os bits do gid"""
+        if gid in self._tile_cache:
+            return self._tile_cache[gid]
+
+        image = None
+        tileset = self.tileset_for(gid)
+        if tileset is not None:
+            image = tileset.tile_surface((gid & GID_MASK) - tileset.firstgid)
+        if image is not None and gid & (FLIPPED_HORIZONTALLY | FLIPPED_VERTICALLY | FLIPPED_DIAGONALLY):
+            if gid & FLIPPED_DIAGONALLY:
+                image = pygame.transform.flip(pygame.transform.rotate(image, 90), False, True)
+            image = pygame.transform.flip(image, bool(gid & FLIPPED_HORIZONTALLY), bool(gid & FLIPPED_VERTICALLY))
+
+        self._tile_cache[gid] = image
+        return image
+
+    def find_object(self, name):
+        for obj in self.objects:
+            if obj['name'] == name:
+                return obj
+        return None
+
+    # ------------------------------------------------------------------
+    # Chunks pré-renderizados
+    # ------------------------------------------------------------------
+    def _bake_chunks(self):
+        """Desenha as camadas visíveis em superfícies de chunk_size x chunk_size.
+
+        Os chunks são opacos (sobre a cor de fundo do mapa): desenhar um chunk sem
+        alpha custa bem menos a cada frame do que um com alpha.
+        """
+        size = self.chunk_size
+        tw, th = self.tile_width, self.tile_height
+        layers = [layer for layer in self.layers if layer[3]]
+        if not layers:
+            return
+        # Últimos chunks dentro do mapa (partes de tiles fora dele não são desenhadas)
+        last_x = (self.width * tw - 1) // size
+        last_y = (self.height * th - 1) // size
+
+        for layer_name, gids, properties, visible, opacity in layers:
+            alpha = int(opacity * 255)
+            for i, gid in enumerate(gids):
+                if not gid:
+                    continue
+                image = self.tile_image(gid)
+                if image is None:
+                    continue
+                x = (i % self.width) * tw
+                # Tiles mais altos que a grade são alinhados pela base (como no Tiled)
+                y = (i // self.width) * th + th - image.get_height()
+                if alpha < 255:
+                    image = image.copy()
+                    image.set_alpha(alpha)
+                # O tile pode cruzar a borda do chunk (tiles grandes ou que não dividem chunk_size):
+                # desenha em todos os chunks do mapa que ele cobre, cada um com seu deslocamento
+                right, bottom = x + image.get_width() - 1, y + image.get_height() - 1
+                for cy in range(max(0, y // size), min(last_y, bottom // size) + 1):
+                    for cx in range(max(0, x // size), min(last_x, right // size) + 1):
+                        chunk = self.chunks.get((cx, cy))
+                        if chunk is None:
+                            chunk = pygame.Surface((size, size))
+                            chunk.fill(self.background_color)
+                            self.chunks[(cx, cy)] = chunk
+                        chunk.blit(image, (x - cx * size, y - cy * size))
+
+        # Chunks prontos não mudam: converte para o formato da tela
+        for key, chunk in self.chunks.items():
+            self.chunks[key] = chunk.convert()
+
+    def draw(self, surface, view_rect, offset=(0, 0)):
+        """Desenha só os chunks que cruzam view_rect (em coordenadas do mundo)"""
+        size = self.chunk_size
+        ox, oy = offset
+        x0, y0 = view_rect.left // size, view_rect.top // size
+        x1, y1 = (view_rect.right - 1) // size, (view_rect.bottom - 1) // size
+        chunks = self.chunks
+        blits = []
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                chunk = chunks.get((cx, cy))
+                if chunk is not None:
+                    blits.append((chunk, (cx * size - view_rect.left + ox, cy * size - view_rect.top + oy)))
+        if blits:
+            surface.blits(blits, doreturn=False)
+        return len(blits)
+
+
+def load_map(path):
+    """Carrega um .tmx; retorna None (jogo segue na arena vazia) se não existir ou for inválido"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        logger.info("✗ Mapa %s vazio ou inexistente, usando arena padrão", path)
+        return None
+    try:
+        tilemap = TileMap(path)
+    except (ET.ParseError, ValueError, KeyError, TypeError) as e:
+        logger.error("❌ Erro ao carregar mapa %s: %s", path, e)
+        return None
+    logger.info("✓ Mapa %s: %dx%d tiles, %d chunks", path, tilemap.width, tilemap.height, len(tilemap.chunks))
+    return tilemap
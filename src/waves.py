@@ -0,0 +1,153 @@
+"""Ondas de inimigos com plano de spawn pré-calculado.
+
+No início de cada nível, plan_level() sorteia (com o random da partida) todos os
+spawns da onda: quando, qual tipo, de que lado, onde e com que velocidade. O
+plano é só dados (SpawnEvent) e pode ser inspecionado para ajustar a curva de
+dificuldade:
+
+    python -m src.waves --levels 1 5 --seed 42
+
+WaveScheduler executa o plano no passo da simulação: ativa os spawns vencidos
+respeitando o máximo de inimigos vivos do nível e no máximo SPAWN_MAX_PER_TICK
+por passo (spawns atrasados esperam o próximo passo, nunca saem todos juntos).
+A parte cara, criar os sprites, é feita fora da simulação em prepare(), que
+enche o pool aos poucos dentro de um orçamento de tempo por frame.
+"""
+import argparse
+import random
+
+import pygame
+
+from src.config import SCREEN_WIDTH, SCREEN_HEIGHT, SPAWN_MAX_PER_TICK, SPAWN_PREPARE_BUDGET_MS
+from src.enemy import Enemy
+from src.enemy_types import ENEMY_TYPES, available_types
+
+
+class WaveParams:
+    """Parâmetros de dificuldade de um nível"""
+    __slots__ = ('count', 'interval', 'max_alive')
+
+    def __init__(self, count, interval, max_alive):
+        self.count = count          # inimigos na onda (derrotar todos passa de nível)
+        self.interval = interval    # ms entre spawns
+        self.max_alive = max_alive  # inimigos vivos ao mesmo tempo
+
+
+def level_params(level):
+    """Curva de dificuldade: ondas maiores, spawns mais rápidos e mais inimigos vivos a cada nível"""
+    return WaveParams(count=10 * level, interval=max(500, 1000 - 100 * (level - 1)), max_alive=5 + level)
+
+
+class SpawnEvent:
+    """Um spawn planejado: tempo (ms desde o início da onda), tipo, lado, posição na borda e velocidade"""
+    __slots__ = ('time', 'kind', 'side', 'offset', 'speed')
+
+    def __init__(self, time, kind, side, offset, speed):
+        self.time = time
+        self.kind = kind
+        self.side = side
+        self.offset = offset
+        self.speed = speed
+
+    def as_list(self):
+        return [self.time, self.kind.name, self.side, self.offset, self.speed]
+
+    @classmethod
+    def from_list(cls, data):
+        time, kind, side, offset, speed = data
+        return cls(time, ENEMY_TYPES[kind], side, offset, speed)
+
+
+def plan_level(level, rng, world):
+    """Todos os spawns da onda de um nível, em ordem de tempo"""
+    params = level_params(level)
+    kinds = available_types(level)
+    weights = [kind.weight for kind in kinds]
+    plan = []
+    for i in range(params.count):
+        kind = kinds[0] if len(kinds) == 1 else rng.choices(kinds, weights)[0]
+        speed = rng.uniform(*kind.speed)
+        side, offset = Enemy.roll_spawn(rng, world)
+        plan.append(SpawnEvent((i + 1) * params.interval, kind, side, offset, speed))
+    return plan
+
+
+class WaveScheduler:
+    """Executa o plano da onda atual, sem rajadas de spawn num único passo"""
+
+    def __init__(self, rng, world, max_per_tick=SPAWN_MAX_PER_TICK):
+        self.rng = rng
+        self.world = world
+        self.max_per_tick = max_per_tick
+        self.level = 0
+        self.params = None
+        self.plan = []
+        self.next = 0      # índice do próximo spawn do plano
+        self.started = 0   # tempo da simulação (ms) em que a onda começou
+
+    def start(self, level, now):
+        """Planeja a onda do nível; retorna quantos inimigos ela tem"""
+        self.level = level
+        self.params = level_params(level)
+        self.plan = plan_level(level, self.rng, self.world)
+        self.next = 0
+        self.started = now
+        return len(self.plan)
+
+    @property
+    def remaining(self):
+        return len(self.plan) - self.next
+
+    def update(self, now, alive, spawn):
+        """Ativa os spawns vencidos (até max_per_tick e até o máximo de vivos) com spawn(kind, event)"""
+        plan = self.plan
+        elapsed = now - self.started
+        spawned = 0
+        while (self.next < len(plan) and plan[self.next].time <= elapsed
+               and spawned < self.max_per_tick and alive + spawned < self.params.max_alive):
+            event = plan[self.next]
+            spawn(event.kind, event)
+            self.next += 1
+            spawned += 1
+        return spawned
+
+    def prepare(self, pool, alive, budget_ms=SPAWN_PREPARE_BUDGET_MS):
+        """Cria aos poucos (fora da simulação) os sprites que a onda ainda vai precisar"""
+        if self.params is None:
+            return True
+        needed = min(self.remaining, self.params.max_alive - alive)
+        return pool.prefill(needed, budget_ms)
+
+    # ------------------------------------------------------------------
+    # Snapshot (src.snapshot)
+    # ------------------------------------------------------------------
+    def dump(self):
+        return {'level': self.level, 'plan': [event.as_list() for event in self.plan], 'next': self.next,
+                'started': self.started}
+
+    def load(self, data):
+        self.level = data['level']
+        self.params = level_params(self.level) if self.level else None
+        self.plan = [SpawnEvent.from_list(event) for event in data['plan']]
+        self.next = data['next']
+        self.started = data['started']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mostra o plano de spawn das ondas")
+    parser.add_argument('--levels', type=int, nargs=2, default=(1, 3), metavar=('PRIMEIRO', 'ÚLTIMO'))
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    world = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+    for level in range(args.levels[0], args.levels[1] + 1):
+        params = level_params(level)
+        print(f"Nível {level}: {params.count} inimigos, a cada {params.interval} ms, até {params.max_alive} vivos")
+        for event in plan_level(level, rng, world):
+            print(f"  {event.time:>7} ms  {event.kind.name:<7} {event.side:<7} {event.offset:>5}  "
+                  f"velocidade {event.speed:.2f}")
+
+
+if __name__ == '__main__':
+    main()